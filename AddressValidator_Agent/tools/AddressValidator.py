@@ -5,7 +5,7 @@ from postal.parser import parse_address
 from pathlib import Path
 import re
 import sys
-import random
+import zlib
 
 try:
     # This works when running through the Agent (adk run)
@@ -48,8 +48,8 @@ class AddressAgent:
             print(f"Using existing database at {self.db_path}") 
 
     def _is_duplicate(self, use_input: str) -> bool:
-        _is_duplicate = random.random() < 0.20
-        return _is_duplicate
+        # Deterministic stand-in for a duplicate register: ~20% of addresses, stable across runs
+        return zlib.crc32(use_input.encode()) % 5 == 0
 
     def validate(self, user_input: str) -> CustomerAddressProfile:
         # 1. Parse with libpostal
@@ -5,11 +5,14 @@ import datetime
 from zoneinfo import ZoneInfo
 from google.adk.tools import FunctionTool
 
+import asyncio
 import requests
 import json
 
 
 AGENT_MODEL = "gemini-2.5-flash"
+# Seconds to wait on the search API before giving up on one account
+SEARCH_TIMEOUT = 15
 
 
 def verify_employee_employer(employee_name: str, employer_name: str) -> str:
@@ -30,7 +33,8 @@ def verify_employee_employer(employee_name: str, employer_name: str) -> str:
     payload = json.dumps({"q": query})
     headers = {'X-API-KEY': api_key, 'Content-Type': 'application/json'}
 
-    response = requests.post(url, headers=headers, data=payload)
+    response = requests.post(url, headers=headers, data=payload, timeout=SEARCH_TIMEOUT)
+    response.raise_for_status()
     results = response.json().get('organic', [])
 
     if not results:
@@ -41,6 +45,31 @@ def verify_employee_employer(employee_name: str, employer_name: str) -> str:
     return f"Verified Match Found: {match.get('title')}\nSnippet: {match.get('snippet')}"
 
 linkedin_tool = FunctionTool(verify_employee_employer)
+
+
+async def _verify_one(sem: asyncio.Semaphore, account: dict) -> dict:
+    employee_name = account.get("full_name") or account.get("employee_name", "")
+    employer_name = account.get("employer_name", "")
+    async with sem:
+        try:
+            # requests is blocking, so each search runs on a worker thread
+            result = await asyncio.to_thread(verify_employee_employer, employee_name, employer_name)
+        except Exception as e:
+            # A failed search (network error, timeout, non-JSON reply) only affects this account
+            return {**account, "verified": False, "linkedin_result": f"Verification failed: {e}"}
+    return {**account, "verified": result.startswith("Verified"), "linkedin_result": result}
+
+
+async def verify_batch(accounts: list[dict]) -> list[dict]:
+    """
+    Verifies a list of dormant accounts against LinkedIn concurrently.
+    Each account needs 'full_name' (or 'employee_name') and 'employer_name'.
+    Returns the accounts with 'verified' and 'linkedin_result' added.
+    """
+    sem = asyncio.Semaphore(10)
+    return list(await asyncio.gather(*(_verify_one(sem, a) for a in accounts)))
+
+linkedin_batch_tool = FunctionTool(verify_batch)
    
 # -- Sequential Agent ---
 dormant_account_agent = Agent(
@@ -61,11 +90,12 @@ dormant_remediation_agent = Agent(
     description="An agent that searches the employee and employer name in the linked in using the tool provided ",
     instruction="""
     You are a remdiation agent. if the employee name and employer name are matching in the linked in search using the tool provided:
-    - Search the employee and employer name for the record
+    - Call 'verify_batch' ONCE with the full list of dormant accounts (full_name, employer_name) instead of looping per record
+    - Only use 'verify_employee_employer' to re-check a single record
     - If they are not matching,save the record in a remediation_accounts.csv
 
     """,
-    tools=[linkedin_tool]
+    tools=[linkedin_batch_tool, linkedin_tool]
 )
 
 root_agent = SequentialAgent(
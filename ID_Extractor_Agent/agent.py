@@ -1,18 +1,92 @@
+import asyncio
+import functools
+import logging
 import os
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 from pydantic import BaseModel, Field
-from google.genai import types
+from google import genai
+from google.genai import errors, types
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools import ToolContext
-from dotenv import load_dotenv
 
 # Ensure this import works based on your folder structure
 from .tools.read_image import load_and_ocr_image
 
-load_dotenv(override=True)
+# Once per process; env already provided by the container wins over .env
+if not os.environ.get("_DOTENV_LOADED"):
+    from dotenv import load_dotenv
+    load_dotenv(override=False)
+    os.environ["_DOTENV_LOADED"] = "1"
 SCRIPT_DIR = Path(__file__).parent.resolve()
 
+logger = logging.getLogger(__name__)
+
+_DATA_DIRS = tuple(p for p in (SCRIPT_DIR / "Data",) if p.is_dir())
+
+# Lower-cased filename -> path, so 'uk_pp_sample3.jpg' finds 'uk_pp_sample3.JPG'
+_KNOWN: dict[str, Path] = {}
+
+def _scan_data_dirs() -> None:
+    _KNOWN.clear()
+    for d in _DATA_DIRS:
+        with os.scandir(d) as entries:
+            for e in entries:
+                if e.is_file():
+                    _KNOWN.setdefault(e.name.lower(), Path(e.path))
+
+def _stat_image(filename: str):
+    """Returns (path, stat) for a data file, or (None, None)."""
+    # A table hit costs one stat; rescan once on a miss or stale entry for files changed at runtime
+    for attempt in range(2):
+        img_path = _KNOWN.get(filename.lower())
+        if img_path is not None:
+            try:
+                return img_path, img_path.stat()
+            except FileNotFoundError:
+                pass
+        if attempt == 0:
+            _scan_data_dirs()
+    return None, None
+
+_scan_data_dirs()
+
+MIME = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
+
+# (filename, st_mtime_ns, st_size) -> (image Part, upload expiry or None), oldest evicted first
+_ARTIFACT_CACHE: dict[tuple, tuple] = {}
+_ARTIFACT_CACHE_MAX = 32
+
+@functools.cache
+def _genai_client() -> genai.Client:
+    return genai.Client()
+
+async def _image_part(img_path: Path):
+    """
+    Uploads the image through the Files API and returns (file URI Part, expiry), so the
+    request carries a short URI instead of base64 bytes. Falls back to inline bytes where
+    the Files API isn't available (e.g. Vertex AI) or the upload fails.
+    """
+    mime = MIME.get(img_path.suffix.lower(), 'image/jpeg')
+    try:
+        uploaded = await _genai_client().aio.files.upload(
+            file=str(img_path), config=types.UploadFileConfig(mime_type=mime)
+        )
+        return types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type or mime), uploaded.expiration_time
+    except ValueError:
+        # Raised by clients without the Files API (Vertex AI)
+        pass
+    except errors.APIError:
+        # Auth, quota and service errors: worth knowing about, but the image can still go inline
+        logger.warning("Files API upload of %s failed; sending it inline", img_path.name, exc_info=True)
+    return await _inline_part(img_path), None
+
+async def _inline_part(img_path: Path) -> types.Part:
+    # Read off the event loop so other sessions keep running during disk I/O
+    image_bytes = await asyncio.to_thread(img_path.read_bytes)
+    return types.Part.from_bytes(data=image_bytes, mime_type=MIME.get(img_path.suffix.lower(), 'image/jpeg'))
+
 class IDExtraction(BaseModel):
     full_name: str = Field(description="The full name as it appears on the ID")
     date_of_birth: Optional[str] = Field(None, description="DOB in YYYY-MM-DD or as seen")
@@ -38,18 +112,31 @@ async def load_image(path: str, tool_context: ToolContext) -> types.Part:
     Loads an image from the agent's Data/ folder and saves as artifact.
     """
     filename = Path(path).name
-    img_path = SCRIPT_DIR / "Data" / filename
-    
-    if not img_path.exists():
-        return f"Error: File not found at {img_path}"
+    img_path, st = _stat_image(filename)
+    if img_path is None:
+        return f"Error: File not found at {SCRIPT_DIR / 'Data' / filename}"
+    filename = img_path.name
 
     try:
-        image_bytes = img_path.read_bytes()
-        mime = "image/png" if img_path.suffix.lower() == ".png" else "image/jpeg"
-        image_part = types.Part.from_bytes(data=image_bytes, mime_type=mime)
+        # Same file, same mtime and size -> reuse the Part instead of re-reading it
+        key = (filename, st.st_mtime_ns, st.st_size)
+        image_part, expires = _ARTIFACT_CACHE.get(key, (None, None))
+        # Uploaded files are deleted by the service after a while, so re-upload once expired
+        if image_part is None or (expires is not None and expires <= datetime.now(timezone.utc)):
+            image_part, expires = await _image_part(img_path)
+            _ARTIFACT_CACHE.pop(key, None)
+            if len(_ARTIFACT_CACHE) >= _ARTIFACT_CACHE_MAX:
+                _ARTIFACT_CACHE.pop(next(iter(_ARTIFACT_CACHE)))
+            _ARTIFACT_CACHE[key] = (image_part, expires)
 
-        # This 'await' now works correctly
-        await tool_context.save_artifact(filename, image_part)
+        # Artifacts are per session, so only save once per session and file version
+        state_key = f"artifact:{filename}"
+        if tool_context.state.get(state_key) != [st.st_mtime_ns, st.st_size]:
+            # The artifact keeps the image bytes: an uploaded file's URI stops working once
+            # the service deletes it, and some artifact services store inline data only
+            artifact = image_part if image_part.inline_data else await _inline_part(img_path)
+            await tool_context.save_artifact(filename, artifact)
+            tool_context.state[state_key] = [st.st_mtime_ns, st.st_size]
         return image_part
         #return f"Success: {filename} loaded. You can now analyze its visual content."
     except Exception as e:
@@ -65,10 +152,11 @@ root_agent = Agent(
     2. Once you receive the image data, examine it carefully to extract details.
     3. If visual details are unclear, call 'load_and_ocr_image' for text assistance.
     4. Cross-reference visual data with OCR text. If they differ, prefer the MRZ (bottom text) for Passports.
-    4. Extract: Full Name, Date of Birth (YYYY-MM-DD), Address, and ID Number.
     5. Use 'clear_history' if you encounter a token limit error or after every 2 extractions.
-    6. Provide the final output strictly in this JSON format:
-    {IDExtraction.model_json_schema()}
+    Return ONLY a JSON object matching the schema.
     """,
     tools=[load_image, load_and_ocr_image, clear_history],
+    # Constrained decoding against IDExtraction, so the reply never needs a re-prompt to fix its JSON
+    output_schema=IDExtraction,
+    output_key="id_extraction",
 )
\ No newline at end of file
@@ -94,6 +94,10 @@ async def inject_id_image(callback_context, llm_request):
 # We bundle the filename and the image together in the user message
     llm_request.contents.append(types.Content(role="user", parts=[image_part, filename_part]))
 
+def _write_json(path: Path, data: dict) -> None:
+    # Serialise and write in one call so it can run off the event loop via asyncio.to_thread
+    path.write_text(json.dumps(data, indent=4))
+
 # --- 3. EXECUTION LOOP ---
 async def main():
     # 1. Initialize result list early to prevent UnboundLocalError
@@ -147,22 +151,14 @@ async def main():
 
             # --- 5. OUTPUT HANDLING ---
             if response_text:
-                # 1. Strip Markdown backticks if Gemini added them
-                    clean_json = response_text.strip()
-                    if clean_json.startswith("```json"):
-                        clean_json = clean_json.removeprefix("```json").removesuffix("```").strip()
-                    elif clean_json.startswith("```"):
-                        clean_json = clean_json.removeprefix("```").removesuffix("```").strip()
-
-                    # 2. Convert the string into a Python Dictionary
-                    extracted_data = json.loads(clean_json)
+                # 1. output_schema forces strict JSON, so validate it straight into the model
+                    extracted_data = IDDetails.model_validate_json(response_text).model_dump()
                     print(f"✅ Extracted: {extracted_data}")
                    
-                    # 3. Save individual file (Optional)
+                    # 2. Save individual file (Optional)
                     individual_file = DATA_DIR / f"{image_path.stem}_data.json"
-                    with open(individual_file, 'w') as f:
-                        json.dump(extracted_data, f, indent=4)
-                        print(f"✅ Success: {image_path.name}")
+                    await asyncio.to_thread(_write_json, individual_file, extracted_data)
+                    print(f"✅ Success: {image_path.name}")
                        
                         # --- NEW DQ AGENT STEP ---
                 # Find matching user data from reference list
@@ -184,16 +180,14 @@ async def main():
                             new_message=types.Content(role="user", parts=[types.Part(text=dq_prompt)])
                         ):
                             if hasattr(dq_event, 'is_final_response') and dq_event.is_final_response():
-                                dq_clean = dq_event.content.parts[0].text.strip().removeprefix("```json").removesuffix("```").strip()
-                                dq_data = json.loads(dq_clean)
+                                dq_data = DQResult.model_validate_json(dq_event.content.parts[0].text).model_dump()
                                 extracted_data.update(dq_data) # Merge DQ result into record
                    
                     print(f"✅ DQ: {extracted_data.get('DQ_result', 'SKIPPED')}")
                     all_results.append(extracted_data)
                    
-                    output_file = f"{image_path.stem}_data.json"
-                    with open(output_file, 'w') as f:
-                        json.dump(extracted_data, f, indent=4)
+                    output_file = Path(f"{image_path.stem}_data.json")
+                    await asyncio.to_thread(_write_json, output_file, extracted_data)
             else:
                 print(f"❌ Failed extraction for {image_path.name}")
              
@@ -255,7 +249,7 @@ id_extractor_agent = LlmAgent(
             address: str | None = None
             id_doc_name: str
     """,
-    #output_schema=IDDetails,
+    output_schema=IDDetails,
     before_model_callback=inject_id_image
 )
 
@@ -272,7 +266,7 @@ id_dq_agent = LlmAgent(
         DQ_result: str  # "PASS" or "FAIL"
         DQ_reason: str | None = None
     """,
-    #output_schema=DQResult,
+    output_schema=DQResult,
     before_model_callback=inject_id_image
 )
        
@@ -2,14 +2,33 @@ from google.adk.agents import LlmAgent
 from google.adk.tools import FunctionTool
 from .tools.AddressValidator import AddressAgent
 from .tools.schemas import address_not_found_response
+import asyncio
 import json
 from datetime import datetime
 from google.cloud import storage
 from dotenv import load_dotenv
 import os
+import threading
 
 load_dotenv(override=True)
 
+_AGENT = None
+_AGENT_LOCK = threading.Lock()
+
+# Markers of an upstream 'not found' payload that is passed straight through
+_ERROR_SENTINELS = ("ADDRESS COULD NOT BE PARSED", '"is_valid": false')
+
+def _get_agent() -> AddressAgent:
+    """Build the AddressAgent once; it holds the SQLite connection and in-memory index."""
+    global _AGENT
+    if _AGENT is None:
+        # Called from worker threads: without the lock, racing calls would each
+        # build an agent and load the whole os_data table
+        with _AGENT_LOCK:
+            if _AGENT is None:
+                _AGENT = AddressAgent(db_path="Data/uk_validation.db")
+    return _AGENT
+
 def upload_to_gcs(data: dict, bucket_name: str):
     """Helper function to upload JSON data to a GCP Bucket."""
     try:
@@ -31,19 +50,20 @@ def upload_to_gcs(data: dict, bucket_name: str):
     except Exception as e:
         print(f"GCS Upload Failed: {e}")
 
-def verify_address_logic(address: str) -> dict:
+async def verify_address_logic(address: str) -> dict:
     # If agent_1 already returned a 'not found' JSON, parse and return it
-    if "ADDRESS COULD NOT BE PARSED" in address or '"is_valid": false' in address:
+    if any(sentinel in address for sentinel in _ERROR_SENTINELS):
         try:
             return json.loads(address)
         except:
             pass # Continue to validation if parsing fails
 
-    agent = AddressAgent(db_path="Data/uk_validation.db")
-    result = agent.validate(address)
+    # libpostal + SQLite are blocking, keep them off the event loop
+    agent = await asyncio.to_thread(_get_agent)
+    result = await asyncio.to_thread(agent.validate, address)
     return result.model_dump()
 
-def validate_and_unify(extraction_state: dict) -> dict:
+async def validate_and_unify(extraction_state: dict) -> dict:
     # Ensure extraction_state is a dict
     data = extraction_state if isinstance(extraction_state, dict) else json.loads(extraction_state)
     
@@ -54,9 +74,9 @@ def validate_and_unify(extraction_state: dict) -> dict:
         address_profile = address_not_found_response(raw_input="No address extracted")
     else:
         try:
-            validator = AddressAgent(db_path="Data/uk_validation.db")
+            validator = await asyncio.to_thread(_get_agent)
             #address_profile = validator.validate(str(address_to_verify))
-            address_profile = validator.validate_bigquery(str(address_to_verify))
+            address_profile = await asyncio.to_thread(validator.validate_bigquery, str(address_to_verify))
         except Exception as e:
             address_profile = address_not_found_response(raw_input=str(address_to_verify))
 
@@ -75,7 +95,7 @@ def validate_and_unify(extraction_state: dict) -> dict:
     # --- GCP BUCKET WRITE ---
     # Set your bucket name here or via environment variable
     BUCKET_NAME = 'lbg-ipi-digitalwallet'
-    upload_to_gcs(combined_output, BUCKET_NAME)
+    await asyncio.to_thread(upload_to_gcs, combined_output, BUCKET_NAME)
     
     return combined_output
 
@@ -85,8 +105,11 @@ address_validator_dq = LlmAgent(
     instruction="""
     You receive the 'extraction_state'.
     Call the 'validate_and_unify' tool to perform database validation and merge the results into the final schema.
+    If it holds more than one person/address, issue all the 'validate_and_unify' calls in the same response.
     Return the final JSON object.
     """,
+    # ADK runs the function calls from one response concurrently (asyncio.gather), so the
+    # async tool above overlaps; there is no per-agent switch for it in google-adk 1.22
     tools=[FunctionTool(validate_and_unify)]
 )
 
@@ -7,6 +7,10 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+_PLACEHOLDERS: frozenset[str] = frozenset(
+    {'n/a', 'na', 'not provided', 'not available', 'none', '', 'null', 'missing'}
+)
+
 # --- 1. THE DATA CONTRACT (FLATTENED FOR ADK COMPATIBILITY) ---
 class PolicyDetails(BaseModel):
     model_config = ConfigDict(
@@ -34,10 +38,11 @@ class PolicyDetails(BaseModel):
     @field_validator('*', mode='before')
     @classmethod
     def normalize_missing(cls, v: Any) -> Any:
-        placeholders = {'n/a', 'na', 'not provided', 'not available', 'none', '', 'null', 'missing'}
-        if v is None or (isinstance(v, str) and v.strip().lower() in placeholders):
+        if v is None:
             return "NOT PROVIDED"
-        return v
+        if not isinstance(v, str):
+            return v
+        return "NOT PROVIDED" if v.strip().lower() in _PLACEHOLDERS else v
 
     @model_validator(mode='after')
     def relocate_missing_info(self) -> 'PolicyDetails':
@@ -1,17 +1,24 @@
 import sqlite3
+import pyarrow as pa
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from postal.parser import parse_address
 from google.cloud import bigquery
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import atexit
+import os
 import re
 import sys
-import random
+import zlib
+import functools
+import logging
+import threading
 
 try:
     # This works when running through the Agent (adk run)
     from .schemas import CustomerAddressDQ, address_not_found_response
-    from .createAddressDB import initialize_database
+    from .createAddressDB import initialize_database, add_name_upper_column, build_fts_index, has_fts_index
 except (ImportError, ValueError):
     # This works when running 'python AddressValidator.py' directly
     # We add the current directory to sys.path to find the siblings
@@ -20,10 +27,153 @@ except (ImportError, ValueError):
         sys.path.append(str(current_dir))
     
     from schemas import CustomerAddressDQ, address_not_found_response
-    from createAddressDB import initialize_database
+    from createAddressDB import initialize_database, add_name_upper_column, build_fts_index, has_fts_index
+
+logger = logging.getLogger(__name__)
+
+_POSTCODE_RE = re.compile(r"^[A-Z]{1,2}[0-9][A-Z0-9]? [0-9][A-Z]{2}$")
+
+def _parse_postcode(postcode: str):
+    """Returns (is_full_format, district) for an upper-cased postcode in one scan."""
+    if not postcode:
+        return False, None
+    district = postcode.split(None, 1)[0]
+    return _POSTCODE_RE.match(postcode) is not None, district
+
+# A full postcode ending the input, as its own token
+_POSTCODE_TAIL_RE = re.compile(r"(?:^|[\s,])([A-Z]{1,2}[0-9][A-Z0-9]? [0-9][A-Z]{2})$")
+_HOUSE_NUMBER_RE = re.compile(r"^(\d+[A-Z]?)\s+(.+)$", re.IGNORECASE)
+_UNIT_RE = re.compile(r"^(FLAT|UNIT|APARTMENT|APT)\b", re.IGNORECASE)
+
+def _parse_uk_address(user_input: str):
+    """
+    Deterministic tokenizer for the common "[number] road, [city] POSTCODE" shape.
+    Returns libpostal-style (value, label) pairs, or None so the caller can fall back.
+    """
+    text = user_input.strip()
+    m = _POSTCODE_TAIL_RE.search(text.upper())
+    if not m:
+        return None
+    postcode = m.group(1)
+    head = text[:m.start(1)].rstrip(', ')
+    parts = [part.strip() for part in head.split(',') if part.strip()]
+
+    parsed = []
+    city = parts.pop() if len(parts) > 1 else None
+    for part in parts:
+        if _UNIT_RE.match(part):
+            parsed.append((part, 'unit'))
+            continue
+        m = _HOUSE_NUMBER_RE.match(part)
+        if m:
+            parsed.append((m.group(1), 'house_number'))
+            part = m.group(2)
+        parsed.append((part, 'road'))
+    if city:
+        parsed.append((city, 'city'))
+    parsed.append((postcode, 'postcode'))
+    return parsed
+
+def _init_postal():
+    # Load libpostal's model once per worker process, not once per address
+    parse_address("1 High Street, London")
+
+def _parse_pairs(user_input: str):
+    # Parse the dominant UK format directly; libpostal only for anything else
+    return _parse_uk_address(user_input) or parse_address(user_input)
+
+# Below this many libpostal fallbacks a batch is parsed in-process
+_POOL_MIN_BATCH = 64
+_POOL_CHUNKSIZE = 32
+# Each libpostal worker loads its ~2GB model, so the pool stays small unless configured
+_POSTAL_WORKERS = int(os.environ.get("ADDRESS_POSTAL_WORKERS", "2"))
+# 5 bound parameters per row keeps each batched query well under SQLite's variable limit
+_SQL_BATCH_ROWS = 1000
+# os_data rows converted to Arrow per fetchmany() call when the agent loads the table
+_LOAD_CHUNK_ROWS = 100_000
+
+# Components that make up the place name searched against NAME1
+_GEO_LABELS = frozenset({'road', 'suburb', 'city', 'neighborhood', 'village', 'hamlet', 'state_district'})
+
+_RESIDENTIAL_TYPES = frozenset({'Postcode', 'Named Road', 'Hamlet', 'Village', 'Other Settlement'})
+
+_DICT_ENCODED_COLUMNS = ('LOCAL_TYPE', 'COUNTRY', 'COUNTY_UNITARY', 'DISTRICT_BOROUGH')
+
+_BQ_PROJECT_ID = "dbs-data-ai-ai-core"
+_BQ_TABLE_ID = f"{_BQ_PROJECT_ID}.lbg_ipi_digitalwallet.os_data"
+
+@functools.cache
+def _bq_client():
+    # Built on first use and shared, so credentials are loaded once per process
+    return bigquery.Client(project=_BQ_PROJECT_ID)
+
+@functools.lru_cache(maxsize=8)
+def _ensure_db(db_path: Path, header_path: Path, data_path: Path) -> None:
+    """Builds or migrates the DB file once per process; later agents skip the stat and schema check."""
+    # Ensure the directory for the DB exists before trying to open/create it
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if not db_path.exists():
+        logger.info("Database not found at %s. Initializing...", db_path)
+        initialize_database(
+            header_path=header_path, 
+            data_folder_path=data_path, 
+            db_path=db_path
+        ) 
+    else:
+        logger.debug("Using existing database at %s", db_path)
+
+    # Databases built before NAME1_UPPER or os_fts existed get them added once
+    with sqlite3.connect(db_path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(os_data)")}
+        if "NAME1_UPPER" not in columns:
+            add_name_upper_column(conn)
+        if not has_fts_index(conn):
+            build_fts_index(conn)
+
+class _ParsedAddress(NamedTuple):
+    addr: dict
+    user_area_context: Optional[str]
+    search_term: str
+    postcode: str
+    input_district: Optional[str]
+    is_full_postcode: bool
+
+def _is_searchable(search_term: str) -> bool:
+    # Empty, single-character or purely numeric terms can never match a place name
+    return len(search_term) >= 2 and not search_term.isdigit()
+
+def _prefix_upper_bound(prefix: str) -> str:
+    # Smallest string greater than every string starting with prefix
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _name_ranges(sorted_names: pa.ChunkedArray) -> dict:
+    """{name: (start, stop)} row range of each distinct name in a sorted column."""
+    ranges = {}
+    prev = None
+    start = 0
+    for offset in range(0, len(sorted_names), _LOAD_CHUNK_ROWS):
+        for i, name in enumerate(sorted_names.slice(offset, _LOAD_CHUNK_ROWS).to_pylist(), offset):
+            if i and name != prev:
+                ranges[prev] = (start, i)
+                start = i
+            prev = name
+    if len(sorted_names):
+        ranges[prev] = (start, len(sorted_names))
+    return ranges
 
 class AddressAgent:
-    def __init__(self, db_path='uk_validation.db'):
+    _COLUMNS = "NAME1_UPPER, POSTCODE_DISTRICT, NAME1, ID, LOCAL_TYPE, POPULATED_PLACE, DISTRICT_BOROUGH, COUNTY_UNITARY, COUNTRY"
+    _Q_WITH_DIST = f"SELECT {_COLUMNS} FROM os_data WHERE NAME1_UPPER >= ? AND NAME1_UPPER < ? AND POSTCODE_DISTRICT >= ? AND POSTCODE_DISTRICT < ? LIMIT 1"
+
+    _Q_BATCH = (
+        "WITH batch(idx, lo, hi, dlo, dhi) AS (VALUES {values}) "
+        f"SELECT b.idx, {_COLUMNS} FROM batch b JOIN os_data os ON os.rowid = ("
+        "SELECT rowid FROM os_data WHERE NAME1_UPPER >= b.lo AND NAME1_UPPER < b.hi "
+        "AND POSTCODE_DISTRICT >= b.dlo AND POSTCODE_DISTRICT < b.dhi LIMIT 1)"
+    )
+
+    def __init__(self, db_path='uk_validation.db', postal_workers: Optional[int] = None):
         script_dir = Path(__file__).resolve().parent
         base_dir = script_dir.parent
 
@@ -35,63 +185,179 @@ class AddressAgent:
         self.header_path = base_dir / "Data/Doc/OS_Open_Names_Header.csv"
         self.data_path = base_dir / "Data/csv"
 
-        # Ensure the directory for the DB exists before trying to open/create it
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        print(db_path)
-       
-        if not self.db_path.exists():
-            print(f"Database not found at {self.db_path}. Initializing...")
-            initialize_database(
-                header_path=self.header_path, 
-                data_folder_path=self.data_path, 
-                db_path=self.db_path
-            ) 
-        else:
-            print(f"Using existing database at {self.db_path}") 
+        logger.debug("Address DB path: %s", self.db_path)
+
+        # One long-lived read-only connection per thread (tools run via asyncio.to_thread),
+        # so the page cache survives between calls without sharing a connection across threads
+        self._tls = threading.local()
+
+        # In-memory copy of os_data, loaded by the first local lookup (see _load_index);
+        # validate_bigquery never needs it, nor the local DB file
+        self._cols = None
+        self._by_name = None
+        self._index_lock = threading.Lock()
+
+        # Per-instance LRU over parse + lookup; repeat customers skip libpostal and the index entirely
+        self._parse_and_lookup = functools.lru_cache(maxsize=10_000)(self._parse_and_lookup_uncached)
+        # libpostal workers for validate_batch, started on first large batch
+        self._postal_workers = max(1, min(postal_workers or _POSTAL_WORKERS, os.cpu_count() or 1))
+        self._postal_pool = None
+        self._pool_lock = threading.Lock()
+
+    def _load_index(self) -> None:
+        """Builds (or migrates) the local DB and loads os_data into memory, once."""
+        if self._cols is not None:
+            return
+        with self._index_lock:
+            if self._cols is not None:
+                return
+            _ensure_db(self.db_path, self.header_path, self.data_path)
+
+            # OS Open Names is static reference data, so keep it in memory as columns
+            # sorted by NAME1_UPPER, plus a hash index from each name to its row range
+            cursor = self._db().execute(f"SELECT {self._COLUMNS} FROM os_data")
+            names = [d[0] for d in cursor.description]
+            schema = pa.schema([(n, pa.string()) for n in names])
+            # Streamed in chunks so only one chunk of rows exists as Python objects at a time
+            batches = []
+            while rows := cursor.fetchmany(_LOAD_CHUNK_ROWS):
+                columns = list(zip(*rows))
+                del rows
+                batches.append(pa.record_batch([pa.array(c, type=pa.string()) for c in columns], schema=schema))
+            table = pa.Table.from_batches(batches, schema=schema)
+            del batches
+            # Arrow's sort is stable, so rows sharing a name keep their rowid order
+            table = table.sort_by('NAME1_UPPER').combine_chunks()
+            by_name = _name_ranges(table.column('NAME1_UPPER'))
+            for name in _DICT_ENCODED_COLUMNS:
+                # A few hundred distinct values across millions of rows: store int32 codes
+                table = table.set_column(table.schema.get_field_index(name), name, table[name].dictionary_encode())
+            self._by_name = by_name
+            self._cols = table
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA cache_size=-131072")  # 128MB
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Map up to 1GB of the file so reads are plain memory loads instead of pread copies
+            conn.execute("PRAGMA mmap_size=1073741824")
+            self._tls.conn = conn
+        return conn
 
     def _is_duplicate(self, use_input: str) -> bool:
-        _is_duplicate = random.random() < 0.20
-        return _is_duplicate
+        # Deterministic stand-in for a duplicate register: ~20% of addresses, stable across runs
+        return zlib.crc32(use_input.encode()) % 5 == 0
 
-    def validate(self, user_input: str) -> CustomerAddressDQ:
-        # 1. Parse with libpostal
-        parsed = parse_address(user_input)
-        addr = {label: value.upper() for value, label in parsed}
+    def _parse_input(self, user_input: str, parsed=None):
+        # 1. Parse the dominant UK format directly; libpostal only for anything else
+        if parsed is None:
+            parsed = _parse_pairs(user_input)
+
+        # Single pass builds the label map, search components and postcode parts
+        addr = {}
+        search_components = []
+        postcode_parts = []
+        for value, label in parsed:
+            v = value.upper()
+            addr[label] = v
+            if label in _GEO_LABELS:
+                search_components.append(v)
+            elif label == 'postcode':
+                postcode_parts.append(v)
         
         user_area_context = addr.get('city') or addr.get('suburb') or addr.get('state_district')
         
-        # Component assembly for search
-        geo_labels = ['road', 'suburb', 'city', 'neighborhood', 'village', 'hamlet', 'state_district']
-        search_components = [val.upper() for val, label in parsed if label in geo_labels]
         search_term = " ".join(search_components).strip()
 
-        if not search_term:
-            search_term = user_input.split(',')[0].strip().upper() if "," in user_input else user_input.split()[0].strip().upper()
-
-        postcode_parts = [value.upper() for value, label in parsed if label == 'postcode']
         postcode = " ".join(postcode_parts).strip()
         
-        # FIX: Added safety check for empty postcode splits
-        input_district = postcode.split()[0] if (postcode and len(postcode.split()) > 0) else None
-        
-        # 2. Database Search
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        db_match = None
-        if search_term:
-            if input_district:
-                query = "SELECT * FROM os_data WHERE upper(NAME1) LIKE ? AND upper(POSTCODE_DISTRICT) LIKE ? LIMIT 1"
-                cursor.execute(query, (f"{search_term}%", f"{input_district}%"))
-                db_match = cursor.fetchone()
-            
-            if not db_match:
-                query = "SELECT * FROM os_data WHERE upper(NAME1) = ? LIMIT 1"
-                cursor.execute(query, (search_term,))
-                db_match = cursor.fetchone()
-        conn.close()
+        is_full_postcode, input_district = _parse_postcode(postcode)
+
+        if not search_term:
+            if is_full_postcode:
+                # Postcode-only input: OS Open Names has a 'Postcode' record named after it
+                search_term = postcode
+            else:
+                first = user_input.split(',')[0] if "," in user_input else (user_input.split() or [""])[0]
+                search_term = first.strip().upper()
+
+        return _ParsedAddress(addr, user_area_context, search_term, postcode, input_district, is_full_postcode)
+
+    def _rows_named(self, name: str) -> range:
+        return range(*self._by_name.get(name, (0, 0)))
+
+    def _row(self, row_id: int) -> dict:
+        return {name: self._cols.column(name)[row_id].as_py() for name in self._cols.column_names}
+
+    def _probe_district(self, row_ids, input_district: str):
+        districts = self._cols.column('POSTCODE_DISTRICT')
+        for row_id in row_ids:
+            if (districts[row_id].as_py() or "").startswith(input_district):
+                return self._row(row_id)
+        return None
+
+    def _lookup(self, search_term: str, input_district: Optional[str]):
+        if not search_term:
+            return None
+        self._load_index()
+
+        row_ids = self._rows_named(search_term)
+        if input_district:
+            hit = self._probe_district(row_ids, input_district)
+            if hit:
+                return hit
+            # Names that merely start with the search term still need the index range scan
+            db_match = self._db().execute(
+                self._Q_WITH_DIST,
+                (search_term, _prefix_upper_bound(search_term), input_district, _prefix_upper_bound(input_district)),
+            ).fetchone()
+            if db_match:
+                return db_match
+
+        return self._row(row_ids[0]) if row_ids else None
+
+    def _lookup_many(self, keys) -> dict:
+        """
+        Same as _lookup for many (search_term, district) keys, but every
+        range-scan fallback goes to SQLite in one joined query per chunk.
+        """
+        self._load_index()
+        matches = {}
+        pending = []
+        for key in keys:
+            search_term, input_district = key
+            row_ids = self._rows_named(search_term)
+            hit = self._probe_district(row_ids, input_district) if input_district else None
+            if hit:
+                matches[key] = hit
+            elif input_district:
+                pending.append(key)
+            else:
+                matches[key] = self._row(row_ids[0]) if row_ids else None
+
+        for start in range(0, len(pending), _SQL_BATCH_ROWS):
+            chunk = pending[start:start + _SQL_BATCH_ROWS]
+            params = []
+            for idx, (search_term, input_district) in enumerate(chunk):
+                params += [idx, search_term, _prefix_upper_bound(search_term),
+                           input_district, _prefix_upper_bound(input_district)]
+            # The connection is query_only, so the batch is a VALUES CTE rather than a temp table
+            query = self._Q_BATCH.format(values=", ".join(["(?, ?, ?, ?, ?)"] * len(chunk)))
+            for row in self._db().execute(query, params):
+                matches[chunk[row['idx']]] = row
+
+        for key in pending:
+            if key not in matches:
+                row_ids = self._rows_named(key[0])
+                matches[key] = self._row(row_ids[0]) if row_ids else None
+        return matches
+
+    def _build_profile(self, parsed: _ParsedAddress, db_match) -> CustomerAddressDQ:
+        addr, user_area_context, search_term, postcode, input_district, is_full_postcode = parsed
 
         # 3. Validation Logic & Risk Scoring
         is_valid = db_match is not None
@@ -102,8 +368,7 @@ class AddressAgent:
         
         if is_valid:
             # Safe access within the is_valid block
-            residential_types = ['Postcode', 'Named Road', 'Hamlet', 'Village', 'Other Settlement']
-            classification = "RESIDENTIAL" if db_match['LOCAL_TYPE'] in residential_types else "BUSINESS"
+            classification = "RESIDENTIAL" if db_match['LOCAL_TYPE'] in _RESIDENTIAL_TYPES else "BUSINESS"
             
             db_city = (db_match['POPULATED_PLACE'] or "").upper()
             db_borough = (db_match['DISTRICT_BOROUGH'] or "").upper()
@@ -112,7 +377,7 @@ class AddressAgent:
                 risk_score += 40
 
             # Postcode Patterns
-            if re.match(r"^[A-Z]{1,2}[0-9][A-Z0-9]? [0-9][A-Z]{2}$", postcode):
+            if is_full_postcode:
                 confidence_level = "HIGH"
             elif input_district or (not postcode and db_match['POSTCODE_DISTRICT']):
                 risk_flags.append("PARTIAL_POSTCODE_DISTRICT")
@@ -136,7 +401,10 @@ class AddressAgent:
             risk_flags.append('DUPLICATE ADDRESSES TRACKED')
             risk_score = min(risk_score + 30, 100)
 
-        return CustomerAddressDQ(
+        # A DB match means every field came from os_data or the scoring above, so skip
+        # re-validating it; the not-found path still goes through full validation
+        build = CustomerAddressDQ.model_construct if is_valid else CustomerAddressDQ
+        return build(
             is_valid=is_valid,
             standardized_address=full_std_addr,
             classification=classification,
@@ -154,129 +422,113 @@ class AddressAgent:
             }
         )
 
-    from google.cloud import bigquery
-    import re
-    from postal.parser import parse_address
+    def _parse_and_lookup_uncached(self, input_key: str):
+        parsed = self._parse_input(input_key)
+        if not _is_searchable(parsed.search_term):
+            return parsed, None
+        # 2. Database Search
+        return parsed, self._lookup(parsed.search_term, parsed.input_district)
+
+    def validate(self, user_input: str) -> CustomerAddressDQ:
+        # The profile (and its duplicate check) is rebuilt every call; only parse + lookup are cached
+        parsed, db_match = self._parse_and_lookup(user_input.strip().upper())
+        if not _is_searchable(parsed.search_term):
+            return address_not_found_response(user_input)
+        return self._build_profile(parsed, db_match)
+
+    def _get_postal_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._postal_pool is None:
+                self._postal_pool = ProcessPoolExecutor(max_workers=self._postal_workers, initializer=_init_postal)
+                # Worker processes are stopped at interpreter exit if close() wasn't called
+                atexit.register(self.close)
+            return self._postal_pool
+
+    def close(self) -> None:
+        """Shuts down the libpostal worker pool, if one was started."""
+        with self._pool_lock:
+            pool, self._postal_pool = self._postal_pool, None
+        if pool is not None:
+            atexit.unregister(self.close)
+            pool.shutdown()
+
+    def validate_batch(self, user_inputs: List[str]) -> List[CustomerAddressDQ]:
+        """
+        Validates many addresses, looking up each distinct
+        (search_term, district) pair only once. Inputs the UK fast path can't
+        handle are sent to libpostal across a pool of worker processes.
+        """
+        pairs = [_parse_uk_address(user_input) for user_input in user_inputs]
+        fallback = [i for i, p in enumerate(pairs) if p is None]
+        if len(fallback) >= _POOL_MIN_BATCH:
+            fallback_inputs = [user_inputs[i] for i in fallback]
+            for i, p in zip(fallback, self._get_postal_pool().map(parse_address, fallback_inputs, chunksize=_POOL_CHUNKSIZE)):
+                pairs[i] = p
+        parsed_inputs = [self._parse_input(user_input, p) for user_input, p in zip(user_inputs, pairs)]
+
+        keys = {(parsed.search_term, parsed.input_district)
+                for parsed in parsed_inputs if _is_searchable(parsed.search_term)}
+        matches = self._lookup_many(keys)
 
-    # Assuming CustomerAddressDQ is already imported/defined
+        results = []
+        for user_input, parsed in zip(user_inputs, parsed_inputs):
+            if not _is_searchable(parsed.search_term):
+                results.append(address_not_found_response(user_input))
+                continue
+            results.append(self._build_profile(parsed, matches[(parsed.search_term, parsed.input_district)]))
+        return results
 
     def validate_bigquery(self, user_input: str) -> CustomerAddressDQ:
         # --- 1. SETUP BIGQUERY CLIENT ---
-        # These should ideally be defined in your class __init__
-        project_id = "dbs-data-ai-ai-core"
-        dataset_id = "lbg_ipi_digitalwallet"
-        table_id = f"{project_id}.{dataset_id}.os_data"
-        client = bigquery.Client(project=project_id)
+        client = _bq_client()
+        table_id = _BQ_TABLE_ID
 
         # --- 2. PARSE WITH LIBPOSTAL ---
-        parsed = parse_address(user_input)
-        addr = {label: value.upper() for value, label in parsed}
-        
-        user_area_context = addr.get('city') or addr.get('suburb') or addr.get('state_district')
-        
-        geo_labels = ['road', 'suburb', 'city', 'neighborhood', 'village', 'hamlet', 'state_district']
-        search_components = [val.upper() for val, label in parsed if label in geo_labels]
-        search_term = " ".join(search_components).strip()
-
-        if not search_term:
-            search_term = user_input.split(',')[0].strip().upper() if "," in user_input else user_input.split()[0].strip().upper()
-
-        postcode_parts = [value.upper() for value, label in parsed if label == 'postcode']
-        postcode = " ".join(postcode_parts).strip()
-        input_district = postcode.split()[0] if (postcode and len(postcode.split()) > 0) else None
+        parsed = self._parse_input(user_input)
+        search_term, input_district = parsed.search_term, parsed.input_district
+        if not _is_searchable(search_term):
+            return address_not_found_response(user_input)
         
         # --- 3. BIGQUERY SEARCH ---
         db_match = None
         if search_term:
-            # We use Parameterized Queries for security and performance
-            params = [bigquery.ScalarQueryParameter("search_term", "STRING", search_term)]
-            
-            if input_district:
-                # Query 1: Refined search with Postcode District
-                query = f"""
-                    SELECT * FROM `{table_id}` 
-                    WHERE NAME1 LIKE @search_term_like 
-                    AND POSTCODE_DISTRICT LIKE @district_like 
-                    LIMIT 1
-                """
-                job_config = bigquery.QueryJobConfig(
-                    query_parameters=[
-                        bigquery.ScalarQueryParameter("search_term_like", "STRING", f"{search_term}%"),
-                        bigquery.ScalarQueryParameter("district_like", "STRING", f"{input_district}%")
-                    ]
+            # One round trip: district-refined matches rank ahead of the name-only fallback.
+            # With no district, @district_like is NULL and the first branch matches nothing.
+            query = f"""
+                SELECT * FROM (
+                    SELECT *, 1 AS prio FROM `{table_id}`
+                    WHERE NAME1 LIKE @search_term_like AND POSTCODE_DISTRICT LIKE @district_like
+                    UNION ALL
+                    SELECT *, 2 AS prio FROM `{table_id}`
+                    WHERE NAME1 = @search_term
                 )
-                query_job = client.query(query, job_config=job_config)
-                rows = list(query_job.result())
-                if rows:
-                    db_match = rows[0]
-
-            if not db_match:
-                # Query 2: Fallback to Name only
-                query = f"SELECT * FROM `{table_id}` WHERE NAME1 = @search_term LIMIT 1"
-                job_config = bigquery.QueryJobConfig(query_parameters=params)
-                query_job = client.query(query, job_config=job_config)
-                rows = list(query_job.result())
-                if rows:
-                    db_match = rows[0]
-
-        # --- 4. VALIDATION LOGIC & RISK SCORING ---
-        is_valid = db_match is not None
-        risk_flags = []
-        risk_score = 0
-        confidence_level = "LOW"
-        classification = "UNKNOWN"
-        
-        if is_valid:
-            residential_types = ['Postcode', 'Named Road', 'Hamlet', 'Village', 'Other Settlement']
-            classification = "RESIDENTIAL" if db_match['LOCAL_TYPE'] in residential_types else "BUSINESS"
-            
-            db_city = (db_match['POPULATED_PLACE'] or "").upper()
-            db_borough = (db_match['DISTRICT_BOROUGH'] or "").upper()
-            if user_area_context and not any(loc == user_area_context for loc in [db_city, db_borough] if loc):
-                risk_flags.append("GEOGRAPHIC_AREA_MISMATCH")
-                risk_score += 40
-
-            if re.match(r"^[A-Z]{1,2}[0-9][A-Z0-9]? [0-9][A-Z]{2}$", postcode):
-                confidence_level = "HIGH"
-            elif input_district or (not postcode and db_match['POSTCODE_DISTRICT']):
-                risk_flags.append("PARTIAL_POSTCODE_DISTRICT")
-                risk_score += 10
-                confidence_level = "MEDIUM"
-            else:
-                risk_flags.append("MISSING_OR_INVALID_POSTCODE")
-                risk_score += 30
-        else:
-            risk_flags.append("ADDRESS_NOT_IN_DATABASE")
-            risk_score = 90
-
-        # --- 5. FINAL CONSTRUCTION ---
-        house_no = addr.get('house_number', '').strip()
-        final_road = db_match['NAME1'] if is_valid else search_term
-        final_pc = postcode if postcode else (db_match['POSTCODE_DISTRICT'] if is_valid else "UNKNOWN")
-        full_std_addr = f"{house_no} {final_road}, {final_pc}".strip(", ").upper()
+                ORDER BY prio
+                LIMIT 1
+            """
+            # We use Parameterized Queries for security and performance
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("search_term", "STRING", search_term),
+                    bigquery.ScalarQueryParameter("search_term_like", "STRING", f"{search_term}%"),
+                    bigquery.ScalarQueryParameter(
+                        "district_like", "STRING", f"{input_district}%" if input_district else None
+                    ),
+                ],
+                use_query_cache=True,
+            )
+            # query_and_wait takes the jobs.query fast path for small reads
+            rows = list(client.query_and_wait(query, job_config=job_config))
+            if rows:
+                db_match = rows[0]
 
-        is_duplicate = self._is_duplicate(full_std_addr)
-        if is_duplicate:
-            risk_flags.append('DUPLICATE ADDRESSES TRACKED')
-            risk_score = min(risk_score + 30, 100)
+        # --- 4. VALIDATION LOGIC, RISK SCORING & FINAL CONSTRUCTION ---
+        return self._build_profile(parsed, db_match)
 
-        return CustomerAddressDQ(
-            is_valid=is_valid,
-            standardized_address=full_std_addr,
-            classification=classification,
-            is_duplicate=is_duplicate,
-            populated_place=db_match['POPULATED_PLACE'] if is_valid else None,
-            district_borough=db_match['DISTRICT_BOROUGH'] if is_valid else None,
-            county=db_match['COUNTY_UNITARY'] if is_valid else None,
-            risk_score=min(risk_score, 100),
-            risk_flags=risk_flags,
-            confidence_level=confidence_level,
-            provider_metadata={
-                "os_id": db_match['ID'] if is_valid else None,
-                "local_type": db_match['LOCAL_TYPE'] if is_valid else "N/A",
-                "country": db_match['COUNTRY'] if is_valid else "UK"
-            }
-        )
+# Load libpostal's model at import so the first request doesn't pay for it
+try:
+    _init_postal()
+except Exception:
+    logger.warning("libpostal warm-up failed", exc_info=True)
 
 if __name__ == "__main__":
     # 1. Initialize the agent
@@ -297,4 +549,4 @@ if __name__ == "__main__":
         print(f"Validating: {addr}")
         result = agent.validate_bigquery(addr)
         print("\n--- Result ---")
-        print(result.model_dump_json(indent=2))
+        print(result.to_json_bytes(indent=2).decode())
@@ -1,4 +1,7 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 import sqlite3
 from postal.parser import parse_address
 from google.cloud import bigquery, storage
@@ -8,7 +11,6 @@ import os
 from dotenv import load_dotenv
 import io
 import pandas as pd
-import pandas_gbq
 import glob
 
 
@@ -48,10 +50,14 @@ def initialize_bigquery_from_local(header_path, data_folder_path):
     for i, file in enumerate(csv_files):
         print(f"Processing {i}: {file}")
         # Read only necessary columns to save memory
-        df = pd.read_csv(file, names=column_names, header=None, low_memory=False)
+        df = pd.read_csv(file, names=column_names, header=None, dtype={'LOCAL_TYPE': 'category'})
         
-        # Filter rows and select columns
-        clean_df = df[df['LOCAL_TYPE'].isin(valid_types)][cols_to_keep]
+        # Filter rows on the categorical codes (a vectorised integer compare) and select columns
+        categories = df['LOCAL_TYPE'].cat.categories
+        valid_codes = [categories.get_loc(t) for t in valid_types if t in categories]
+        clean_df = df[df['LOCAL_TYPE'].cat.codes.isin(valid_codes)][cols_to_keep]
+        # Back to plain strings so the frames concat cleanly and match the STRING schema
+        clean_df = clean_df.astype({'LOCAL_TYPE': str})
         df_list.append(clean_df)
 
     # Concatenate all at once
@@ -59,54 +65,114 @@ def initialize_bigquery_from_local(header_path, data_folder_path):
 
     print(f"Total rows to upload: {len(final_df)}")
 
-    # Upload to BigQuery
-    # Note: 'replace' will overwrite the table every time the script runs. 
-    # Use 'append' if you are processing files in batches over time.
-    pandas_gbq.to_gbq(final_df, table_id, project_id=project_id, if_exists='replace')
+    # Upload to BigQuery as Parquet (columnar, typed, compressed)
+    # Note: WRITE_TRUNCATE will overwrite the table every time the script runs. 
+    # Use WRITE_APPEND if you are processing files in batches over time.
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        clustering_fields=['NAME1'],
+        schema=[bigquery.SchemaField(col, "STRING") for col in cols_to_keep],
+    )
+    job = client_bq.load_table_from_dataframe(final_df, f"{project_id}.{table_id}", job_config=job_config)
+    job.result()
 
 def initialize_database(header_path, data_folder_path, db_path='uk_validation.db'):
     header_df = pd.read_csv(header_path)
     column_names = header_df.columns.tolist()
 
+    # ADD 'ID' HERE 
+    cols_to_keep = [
+        'ID', 
+        'NAME1', 
+        'LOCAL_TYPE', 
+        'POSTCODE_DISTRICT', 
+        'POPULATED_PLACE', 
+        'DISTRICT_BOROUGH',
+        'COUNTY_UNITARY', 
+        'COUNTRY'
+    ]
+    valid_types = pa.array(['Postcode', 'Named Road', 'Village', 'Hamlet'])
+
     conn = sqlite3.connect(db_path)
+    # page_size only applies to a fresh file, so it has to precede WAL and the first CREATE TABLE
+    conn.execute("PRAGMA page_size=8192")
+    # Bulk-load settings: no fsync per page, temp b-trees and a 256MB cache in memory
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-262144")
     conn.execute("DROP TABLE IF EXISTS os_data")
+    conn.execute(f"CREATE TABLE os_data ({', '.join(f'{c} TEXT' for c in cols_to_keep)})")
+    insert_sql = f"INSERT INTO os_data VALUES ({', '.join('?' * len(cols_to_keep))})"
 
     csv_files = glob.glob(os.path.join(data_folder_path, "*.csv"))
-    
+
+    # Columnar, multi-threaded parse of only the columns we keep
+    read_options = pv.ReadOptions(column_names=column_names)
+    convert_options = pv.ConvertOptions(
+        include_columns=cols_to_keep,
+        column_types={c: pa.string() for c in cols_to_keep},
+        strings_can_be_null=True,
+    )
+
+    conn.execute("BEGIN EXCLUSIVE")
     for file in csv_files:
         if "header" in file.lower(): continue
-        
-        df = pd.read_csv(file, names=column_names, header=None, low_memory=False)
-        
-        # ADD 'ID' HERE 
-        cols_to_keep = [
-            'ID', 
-            'NAME1', 
-            'LOCAL_TYPE', 
-            'POSTCODE_DISTRICT', 
-            'POPULATED_PLACE', 
-            'DISTRICT_BOROUGH',
-            'COUNTY_UNITARY', 
-            'COUNTRY'
-        ]
-        
-        valid_types = ['Postcode', 'Named Road', 'Village', 'Hamlet']
-        clean_df = df[df['LOCAL_TYPE'].isin(valid_types)][cols_to_keep]
 
-        clean_df.to_sql('os_data', conn, if_exists='append', index=False)
+        table = pv.read_csv(file, read_options=read_options, convert_options=convert_options)
+        table = table.filter(pc.is_in(table['LOCAL_TYPE'], value_set=valid_types))
+
+        rows = list(zip(*(table[c].to_pylist() for c in cols_to_keep)))
+        for start in range(0, len(rows), 10_000):
+            conn.executemany(insert_sql, rows[start:start + 10_000])
 
+    # Indexes are built once after the load, in the same transaction
     conn.execute("CREATE INDEX idx_name ON os_data (NAME1)")
+    add_name_upper_column(conn)
+    build_fts_index(conn)
+    conn.commit()
     conn.close()
     print(f"Success! Database {db_path} is ready.")
 
+def add_name_upper_column(conn):
+    # Stored upper-case copy of NAME1 so prefix lookups are sargable range scans
+    conn.execute("ALTER TABLE os_data ADD COLUMN NAME1_UPPER TEXT")
+    conn.execute("UPDATE os_data SET NAME1_UPPER = upper(NAME1)")
+    # Covering index: validate() is answered from the index leaf without touching the table
+    conn.execute(
+        "CREATE INDEX idx_name_covering ON os_data (NAME1_UPPER, POSTCODE_DISTRICT, NAME1, ID, "
+        "LOCAL_TYPE, POPULATED_PLACE, DISTRICT_BOROUGH, COUNTY_UNITARY, COUNTRY)"
+    )
+    conn.execute("ANALYZE")
+
+def build_fts_index(conn):
+    # Inverted index over NAME1 for road searches; LIKE '%road%' can't use a B-tree
+    conn.execute("DROP TABLE IF EXISTS os_fts")
+    conn.execute(
+        "CREATE VIRTUAL TABLE os_fts USING fts5(NAME1, content='os_data', "
+        "tokenize='unicode61', prefix='2 3 4')"
+    )
+    conn.execute("INSERT INTO os_fts(rowid, NAME1) SELECT rowid, NAME1 FROM os_data")
+
+def has_fts_index(conn):
+    # Databases built before os_fts existed don't have it until they're migrated
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'os_fts'").fetchone() is not None
+
 # 2. VALIDATION LOGIC
+def _road_and_postcode(parsed):
+    # One pass over libpostal's pairs, only upper-casing the two labels we use
+    road = postcode = None
+    for value, label in parsed:
+        if label == 'road':
+            road = value.upper()
+        elif label == 'postcode':
+            postcode = value.upper()
+    return road, postcode
+
 def validate_uk_input(user_input, db_path='uk_validation.db'):
     # Parse the messy user input
     parsed = parse_address(user_input)
-    addr = {label: value.upper() for value, label in parsed}
-    
-    user_road = addr.get('road')
-    user_postcode = addr.get('postcode')
+    user_road, user_postcode = _road_and_postcode(parsed)
     
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -121,8 +187,20 @@ def validate_uk_input(user_input, db_path='uk_validation.db'):
 
     # Check Road/Street
     if user_road:
-        # Use LIKE for partial matches (e.g., 'Main St' vs 'Main Street')
-        cursor.execute("SELECT * FROM os_data WHERE NAME1 LIKE ? AND LOCAL_TYPE = 'Named Road'", (f"%{user_road}%",))
+        if has_fts_index(conn):
+            # Prefix phrase match on the FTS index (e.g., 'Main St' vs 'Main Street')
+            road_token = '"' + user_road.replace('"', '""') + '"*'
+            cursor.execute(
+                "SELECT d.* FROM os_fts f JOIN os_data d ON d.rowid = f.rowid "
+                "WHERE os_fts MATCH ? AND d.LOCAL_TYPE = 'Named Road' LIMIT 1",
+                (road_token,),
+            )
+        else:
+            # Unmigrated database: fall back to a LIKE scan for partial matches
+            cursor.execute(
+                "SELECT * FROM os_data WHERE NAME1 LIKE ? AND LOCAL_TYPE = 'Named Road' LIMIT 1",
+                (f"%{user_road}%",),
+            )
         match = cursor.fetchone()
         if match:
             results["valid_road"] = True
@@ -141,10 +219,7 @@ def validate_uk_input_bq(user_input):
     
     # 2. Parse the messy user input
     parsed = parse_address(user_input)
-    addr = {label: value.upper() for value, label in parsed}
-    
-    user_road = addr.get('road')
-    user_postcode = addr.get('postcode')
+    user_road, user_postcode = _road_and_postcode(parsed)
     
     results = {"valid_road": False, "valid_postcode": False, "matches": []}
 
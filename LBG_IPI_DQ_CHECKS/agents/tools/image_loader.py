@@ -1,6 +1,9 @@
+import logging
 from pathlib import Path
 from google.genai import types
 
+logger = logging.getLogger(__name__)
+
 def load_image_tool(path: str) -> dict:
     p = Path(path)
     if not p.is_absolute():
@@ -10,7 +13,7 @@ def load_image_tool(path: str) -> dict:
     else:
         img_path = p
 
-    print(img_path)
+    logger.debug("Loading image %s", img_path)
 
     if not img_path.exists():
         return {"error": f"Image file not found: {img_path}"}
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import to_json
 from typing import List, Optional
 
 class DetailsFromID(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid', validate_assignment=False)
+
     full_name: str
     id_number: str
     date_of_birth: str | None = None
@@ -9,6 +12,8 @@ class DetailsFromID(BaseModel):
     id_doc_name: str
 
 class CustomerAddressDQ(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid', validate_assignment=False)
+
     is_valid: bool
     standardized_address: str
     classification: str = Field(description="RESIDENTIAL, BUSINESS, or UNKNOWN")
@@ -23,7 +28,13 @@ class CustomerAddressDQ(BaseModel):
     confidence_level: str
     provider_metadata: dict
 
+    def to_json_bytes(self, indent: Optional[int] = None) -> bytes:
+        # Serialised straight to bytes by pydantic-core; compact unless indent is asked for
+        return to_json(self, indent=indent)
+
 class FinalValidationResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid', validate_assignment=False)
+
     DetailsFromID: DetailsFromID
     CustomerAddressDQ: CustomerAddressDQ
 
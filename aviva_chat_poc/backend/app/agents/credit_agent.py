@@ -1,16 +1,16 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
 
 class CreditAgent(BaseAgent):
     name = "credit_agent"
 
-    def __init__(self) -> None:
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None) -> None:
+        self.llm = llm or LlmClient()
 
     async def run(self, context: dict) -> dict:
         result = await self.llm.complete(
             system_prompt="You are a Credit history system.",
             user_prompt="Return Credit Score as JSON."
         )
-        return json.loads(result)
+        return from_json(result)
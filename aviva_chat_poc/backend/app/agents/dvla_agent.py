@@ -1,12 +1,12 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
 
 class DVLAAgent(BaseAgent):
     name = "dvla_agent"
 
-    def __init__(self) -> None:
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None) -> None:
+        self.llm = llm or LlmClient()
 
     async def run(self, context: dict) -> dict:
         prompt = f"""
@@ -19,4 +19,4 @@ class DVLAAgent(BaseAgent):
             user_prompt=prompt
         )
 
-        return json.loads(result)
\ No newline at end of file
+        return from_json(result)
\ No newline at end of file
@@ -1,16 +1,16 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
 
 class FraudAgent(BaseAgent):
     name = "fraud_agent"
 
-    def __init__(self) -> None:
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None) -> None:
+        self.llm = llm or LlmClient()
 
     async def run(self, context: dict) -> dict:
         result = await self.llm.complete(
             system_prompt="You are a insurance/credit fraud monitoring system.",
             user_prompt="Return fraud risk as JSON."
         )
-        return json.loads(result)
+        return from_json(result)
@@ -1,15 +1,26 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```\s*$", re.S)
+# A complete "vehicle_reg": "..." pair in a partially generated response
+_VEHICLE_REG_RE = re.compile(r'"vehicle_reg"\s*:\s*"([^"\\]*)"')
 
 class IntentAgent(BaseAgent):
     name = "intent_agent"
 
-    def __init__(self):
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None):
+        self.llm = llm or LlmClient()
 
-    async def run(self, context: dict) -> dict:
-        prompt = f"""
+    system_prompt = "You are a Motor insurance agent. Always respond with valid JSON only."
+
+    @staticmethod
+    def _prompt(context: dict) -> str:
+        return f"""
         Extract motor insurance intent and fields from the message.
         Return ONLY valid JSON with these fields:
         {{"intent": "", "vehicle_reg": "", "driver_age": "", "postcode": ""}}
@@ -18,21 +29,42 @@ class IntentAgent(BaseAgent):
         
         Response must be valid JSON only, no markdown, no explanation.
         """
+
+    async def run(self, context: dict) -> dict:
         result = await self.llm.complete(
-            system_prompt="You are a Motor insurance agent. Always respond with valid JSON only.",
-            user_prompt=prompt
+            system_prompt=self.system_prompt,
+            user_prompt=self._prompt(context)
         )
+        return self._parse(result)
+
+    async def run_speculative(self, context: dict, on_vehicle_reg) -> dict:
+        """
+        Like run, but streams the response and calls on_vehicle_reg(reg) as soon as
+        the vehicle_reg value has been generated, before the rest of the JSON.
+        """
+        result = ""
+        reg_seen = False
+        async for chunk in self.llm.complete_stream(
+            system_prompt=self.system_prompt,
+            user_prompt=self._prompt(context)
+        ):
+            result += chunk
+            if not reg_seen:
+                m = _VEHICLE_REG_RE.search(result)
+                if m:
+                    reg_seen = True
+                    on_vehicle_reg(m.group(1))
+        return self._parse(result.strip())
 
-        print(f"LLM Response: '{result}'")
-        result = result.strip()
-        if result.startswith("```json"):
-            result = result.replace("```json", "").replace("```", "").strip()
+    def _parse(self, result: str) -> dict:
+        logger.debug("LLM Response: %r", result)
+        m = _FENCE_RE.match(result)
+        result = m.group(1) if m else result.strip()
 
         try:
-            return json.loads(result)
-        except json.JSONDecodeError as e:
-            print(f"JSON Parse Error: {e}")
-            print(f"Raw result: {result}")
+            return from_json(result)
+        except ValueError as e:
+            logger.warning("JSON Parse Error: %s; raw result: %r", e, result)
             # Return a default structure instead of crashing
             return {
                 "intent": "quote_request",
@@ -40,4 +72,4 @@ class IntentAgent(BaseAgent):
                 "driver_age": "",
                 "postcode": "",
                 "error": f"Failed to parse LLM response: {str(e)}"
-            }
\ No newline at end of file
+            }
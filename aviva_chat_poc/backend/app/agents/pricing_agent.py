@@ -1,12 +1,12 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
 
 class PricingAgent(BaseAgent):
     name = "pricing_agent"
 
-    def __init__(self) -> None:
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None) -> None:
+        self.llm = llm or LlmClient()
 
     async def run(self, context: dict) -> dict:
 
@@ -19,5 +19,5 @@ class PricingAgent(BaseAgent):
             user_prompt=prompt
         )
 
-        return json.loads(result)
+        return from_json(result)
 
@@ -5,20 +5,31 @@ import json
 class QuoteAgent(BaseAgent):
     name = "quote_agent"
 
-    def __init__(self):
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None):
+        self.llm = llm or LlmClient()
 
-    async def run(self, context: dict) -> dict:
-        prompt = f"""
+    system_prompt = "You are a customer-facing insurance chatbot."
+
+    @staticmethod
+    def _prompt(context: dict) -> str:
+        return f"""
         Present quotes conversationally.
         Data:
         {context}
         """
 
+    async def run(self, context: dict) -> dict:
         message = await self.llm.complete(
-            system_prompt="You are a customer-facing insurance chatbot.",
-            user_prompt=prompt
+            system_prompt=self.system_prompt,
+            user_prompt=self._prompt(context)
         )
 
         return {"message": message}
 
+    async def run_stream(self, context: dict):
+        async for chunk in self.llm.complete_stream(
+            system_prompt=self.system_prompt,
+            user_prompt=self._prompt(context)
+        ):
+            yield chunk
+
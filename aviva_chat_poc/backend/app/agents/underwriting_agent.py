@@ -1,12 +1,12 @@
 from agents.base import BaseAgent
 from llm.llm_client import LlmClient
-import json
+from pydantic_core import from_json
 
 class UnderwritingAgent(BaseAgent):
     name = "underwriting_agent"
 
-    def __init__(self):
-        self.llm = LlmClient()
+    def __init__(self, llm: LlmClient | None = None):
+        self.llm = llm or LlmClient()
 
     async def run(self, context: dict) -> dict:
         prompt = f"""
@@ -22,5 +22,5 @@ class UnderwritingAgent(BaseAgent):
             user_prompt=prompt
         )
 
-        return json.loads(result)
+        return from_json(result)
 
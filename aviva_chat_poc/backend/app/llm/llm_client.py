@@ -1,26 +1,79 @@
+import asyncio
+import functools
+import hashlib
 import os
-from openai import OpenAI
+import time
+from collections import OrderedDict
+from openai import AsyncOpenAI
 
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+@functools.cache
+def _async_client() -> AsyncOpenAI:
+    # Process-wide, httpx pools the connections across concurrent calls
+    return AsyncOpenAI(
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        api_key=os.getenv("GOOGLE_API_KEY"),
+    )
+
+# Claims/Credit/Fraud send the same prompt every request, so responses are cached by prompt
+_CACHE_MAX = 1024
+_CACHE_TTL_S = 300
+
 class LlmClient:
     def __init__(self):
-        self.client = OpenAI(
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-        )
+        self.client = _async_client()
+        self._cache = OrderedDict()  # key -> (expires_at, response)
+        self._cache_lock = asyncio.Lock()
+
+    @staticmethod
+    def _cache_key(system_prompt: str, user_prompt: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(system_prompt.encode())
+        h.update(b"\0")
+        h.update(user_prompt.encode())
+        return h.digest()
 
     async def complete(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
+        key = self._cache_key(system_prompt, user_prompt)
+        async with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit and hit[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return hit[1]
+
+        result = await self._complete_uncached(system_prompt, user_prompt)
+
+        async with self._cache_lock:
+            self._cache[key] = (time.monotonic() + _CACHE_TTL_S, result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > _CACHE_MAX:
+                self._cache.popitem(last=False)
+        return result
+
+    async def complete_stream(self, system_prompt: str, user_prompt: str):
+        """Yields the response text as it is generated (not cached)."""
+        stream = await self.client.chat.completions.create(
             model="gemini-2.0-flash",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
+            stream=True,
         )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
-        print(response)
+    async def _complete_uncached(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self.client.chat.completions.create(
+            model="gemini-2.0-flash",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
 
         return response.choices[0].message.content.strip()
\ No newline at end of file
@@ -1,10 +1,20 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from orchestrator import ChatOrchestrator
 from openai import OpenAI
 from dotenv import load_dotenv
 import json
+import logging
+import logging.handlers
+import queue
+
+# Log records go through a queue so the event loop never waits on stdout
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.WARNING, handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
 
 app = FastAPI()
 
@@ -39,4 +49,20 @@ async def chat_with_ai(input_data: ChatInput):
             return {"bot_response": response.get("bot_response", response.get("hello", "No response"))}
         return {"bot_response": str(response)}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(chunks):
+    # Server-sent events: every line of a chunk needs its own "data:" prefix
+    async def events():
+        async for chunk in chunks:
+            yield "".join(f"data: {line}\n" for line in chunk.split("\n")) + "\n"
+        yield "event: done\ndata: \n\n"
+    return events()
+
+@app.post("/chat/stream")
+async def chat_with_ai_stream(input_data: ChatInput):
+    # The quote is forwarded token by token; the enrichment agents still run to completion first
+    return StreamingResponse(
+        _sse(orchestrator.run_streaming(input_data.user_message)),
+        media_type="text/event-stream",
+    )
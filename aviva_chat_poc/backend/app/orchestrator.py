@@ -7,34 +7,80 @@ from agents.fraud_agent import FraudAgent
 from agents.underwriting_agent import UnderwritingAgent
 from agents.pricing_agent import PricingAgent
 from agents.quote_agent import QuoteAgent
+from llm.llm_client import LlmClient
 
 class ChatOrchestrator:
+    # Start DVLA from the streamed intent as soon as vehicle_reg appears
+    speculative_dvla = True
 
-    async def run(self, user_message: str) -> dict:
-        
+    def __init__(self) -> None:
+        # One client for every agent so the HTTP connection pool is reused
+        self.llm = LlmClient()
+
+    async def _enrich(self, user_message: str) -> dict:
+        """Stages 1-3: everything the QuoteAgent needs in its context."""
+        context = {"user_message": user_message}
+        llm = self.llm
+
+        # DVLA only needs the reg, so it can start while the rest of the intent JSON is generated
+        speculative = {}
+        def start_dvla(reg):
+            speculative[reg] = asyncio.create_task(DVLAAgent(llm).run({"vehicle_reg": reg}))
+
+        if self.speculative_dvla:
+            intent_task = asyncio.create_task(IntentAgent(llm).run_speculative(context, start_dvla))
+        else:
+            intent_task = asyncio.create_task(IntentAgent(llm).run(context))
+        # Claims/Credit/Fraud don't read the intent fields, start them alongside intent
+        claims_task = asyncio.create_task(ClaimsAgent(llm).run(context))
+        credit_task = asyncio.create_task(CreditAgent(llm).run(context))
+        fraud_task = asyncio.create_task(FraudAgent(llm).run(context))
+
+        # 1️⃣ Intent
         try:
-            context = {"user_message": user_message}
-            
+            context.update(await intent_task)
+        except BaseException:
+            for task in (claims_task, credit_task, fraud_task, *speculative.values()):
+                task.cancel()
+            raise
 
-            # 1️⃣ Intent
-            context.update(await IntentAgent().run(context))
+        # 2️⃣ Parallel enrichment (DVLA is the only one that needs the reg)
+        # Reuse the speculative call only if the final intent kept the same reg
+        dvla_task = speculative.pop(str(context.get("vehicle_reg")), None)
+        for task in speculative.values():
+            task.cancel()
+        if dvla_task is None:
+            dvla_task = asyncio.create_task(DVLAAgent(llm).run(context))
+        enrichment = await asyncio.gather(
+            dvla_task,
+            claims_task,
+            credit_task,
+            fraud_task,
+        )
 
-            # 2️⃣ Parallel enrichment
-            enrichment = await asyncio.gather(
-                DVLAAgent().run(context),
-                ClaimsAgent().run(context),
-                CreditAgent().run(context),
-                FraudAgent().run(context),
-            )
+        for data in enrichment:
+            context.update(data)
 
-            for data in enrichment:
-                context.update(data)
+        # 3️⃣ Risk & pricing
+        context.update(await UnderwritingAgent(llm).run(context))
+        context.update(await PricingAgent(llm).run(context))
+        return context
 
-            # 3️⃣ Risk & pricing
-            context.update(await UnderwritingAgent().run(context))
-            context.update(await PricingAgent().run(context))
+    async def run(self, user_message: str) -> dict:
+        
+        try:
+            context = await self._enrich(user_message)
 
             # 4️⃣ Final response
-            return await QuoteAgent().run(context)
+            return await QuoteAgent(self.llm).run(context)
         except Exception as e:
             return {"bot_response": f"Error: {str(e)}"}
+
+    async def run_streaming(self, user_message: str):
+        """Same pipeline as run, but yields the final QuoteAgent reply as it is generated."""
+        try:
+            context = await self._enrich(user_message)
+            async for chunk in QuoteAgent(self.llm).run_stream(context):
+                yield chunk
+        except Exception as e:
+            yield f"Error: {str(e)}"
@@ -9,26 +9,51 @@ appropriate specialized agents based on the customer's needs.
 """
 
 from google.adk.agents.llm_agent import Agent
+import logging
+from google.adk.agents import ParallelAgent
 import os
-import sys
-from dotenv import load_dotenv
-from pathlib import Path
 
-# Load environment variables
-load_dotenv(override=True)
+# Load environment variables once per process; env already provided by the
+# container (Cloud Run/K8s secrets) wins over .env
+if not os.environ.get("_DOTENV_LOADED"):
+    from dotenv import load_dotenv
+    load_dotenv(override=False)
+    os.environ["_DOTENV_LOADED"] = "1"
 
-# Add the package directory to sys.path so imports work correctly
-SCRIPT_DIR = Path(__file__).parent.resolve()
-if str(SCRIPT_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPT_DIR))
+# Default to INFO; a handler configured by the host (e.g. adk web) takes precedence
+logging.basicConfig(level=logging.INFO)
 
 # Import sub-agents
-from agents.auth_agent import auth_agent
-from agents.policy_manager import policy_manager_agent
-from agents.comparison_agent import comparison_agent
-from agents.suggestion_agent import suggestion_agent
-from agents.purchase_agent import purchase_agent
-from agents.retention_agent import retention_agent
+from .agents.auth_agent import auth_agent
+from .agents.policy_manager import policy_manager_agent
+from .agents.comparison_agent import comparison_agent
+from .agents.suggestion_agent import suggestion_agent
+from .agents.purchase_agent import purchase_agent
+from .agents.retention_agent import retention_agent
+from .routing_cache import route_from_cache, remember_route
+from .prompts import COMMON_TONE, ROUTING_RULES
+
+
+# Full coverage review: comparison and suggestions are read-only, so they can run side by side.
+# An agent can only have one parent, hence the clones.
+review_fanout = ParallelAgent(
+    name='review_fanout',
+    description='Runs the market comparison and personalised suggestions concurrently for a full coverage review.',
+    sub_agents=[
+        comparison_agent.clone(update={'name': 'review_comparison_agent'}),
+        suggestion_agent.clone(update={'name': 'review_suggestion_agent'}),
+    ]
+)
+
+
+# Routing instruction - static, so it is never templated and stays byte-identical per call
+ROOT_INSTRUCTION_STATIC = f"""You are the main virtual assistant for Aviva Insurance.
+Welcome customers warmly, delegate their request to the right specialist agent,
+and afterwards ask if there's anything else. Be polite, concise and slightly formal.
+
+{ROUTING_RULES}
+
+{COMMON_TONE}"""
 
 
 # Root agent - the main orchestrator
@@ -36,84 +61,18 @@ root_agent = Agent(
     model='gemini-2.5-flash',
     name='root_agent',
     description='Aviva Insurance virtual assistant - helps customers with all insurance needs.',
-    instruction="""You are the main virtual assistant for Aviva Insurance.
-    
-Welcome customers warmly and help them with their insurance needs by delegating to specialized agents.
-
-## Your Sub-Agents
-
-1. **auth_agent**: Handles customer identification and verification
-   - Use first for new conversations to identify if customer is new or existing
-   - Manages secure authentication flow
-
-2. **policy_manager_agent**: Manages existing policies
-   - List policies, view details
-   - Renew policies, modify coverage
-   - Initiate cancellations (routes to retention)
-
-3. **comparison_agent**: Compares policies with competitors
-   - Shows how our rates compare to market
-   - Helps justify policy value
-
-4. **suggestion_agent**: Provides policy recommendations
-   - Analyzes life events (marriage, new baby, etc.)
-   - Identifies coverage gaps
-   - Makes personalized suggestions
-
-5. **purchase_agent**: Handles new policy purchases
-   - Provides quotes
-   - Collects policy details
-   - Completes purchases
-
-6. **retention_agent**: Retains customers wanting to cancel
-   - Presents special offers
-   - Processes cancellations if customer insists
-
-## Conversation Flow
-
-1. **Start**: Always begin by identifying the customer (delegate to auth_agent)
-2. **Authenticated**: Once verified, understand what they need
-3. **Route**: Delegate to the appropriate specialist agent
-4. **Follow-up**: After specialist completes, ask if there's anything else
-
-## Guidelines
-
-- Be warm, professional, and helpful at all times
-- Always ensure customer is authenticated before accessing their policies
-- Proactively mention relevant offers or recommendations
-- For cancellations, ALWAYS route to retention_agent first
-- Keep responses concise but complete
-- Use emojis sparingly for a friendly touch
-
-## Example Interactions
-
-- "I want to see my policies" → auth_agent (if not authenticated) → policy_manager_agent
-- "Compare my car insurance" → auth_agent → comparison_agent
-- "I want to buy life insurance" → auth_agent → purchase_agent
-- "Cancel my policy" → auth_agent → retention_agent
-- "My daughter is turning 18" → auth_agent → suggestion_agent
-
-## Handling Policy IDs
-
-If a user provides ONLY a policy ID (e.g. "POL002"):
-1. Check the context of the conversation.
-2. If discussing comparison -> Route to **comparison_agent**
-3. If discussing cancellation -> Route to **retention_agent**
-4. If discussing renewal/details -> Route to **policy_manager_agent**
-5. If unsure -> Ask clarifying question
-
-Guidelines for Tone:
-- Use British English spelling (e.g., 'colour', 'centre', 'programme').
-- Be polite and professional (use 'please', 'thank you', 'cheers' occasionally if appropriate).
-- Maintain a helpful, slightly formal but friendly British persona.
-
-Remember: You are the face of Aviva Insurance. Make every interaction count!""",
+    # Sent verbatim as the system instruction, so Gemini can cache the prefix across turns
+    static_instruction=ROOT_INSTRUCTION_STATIC,
+    # Repeat requests are routed from the cache without a model call
+    before_model_callback=route_from_cache,
+    after_model_callback=remember_route,
     sub_agents=[
         auth_agent,
         policy_manager_agent,
         comparison_agent,
         suggestion_agent,
         purchase_agent,
-        retention_agent
+        retention_agent,
+        review_fanout
     ]
 )
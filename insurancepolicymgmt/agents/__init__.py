@@ -4,12 +4,27 @@ Agents Package Initializer
 Exports all sub-agents for use by the root agent.
 """
 
-from agents.auth_agent import auth_agent
-from agents.policy_manager import policy_manager_agent
-from agents.comparison_agent import comparison_agent
-from agents.suggestion_agent import suggestion_agent
-from agents.purchase_agent import purchase_agent
-from agents.retention_agent import retention_agent
+# Sub-agent modules are imported on first attribute access (PEP 562), so
+# `import agents` doesn't pull in every tools module up front
+_AGENT_MODULES = {
+    'auth_agent': 'auth_agent',
+    'policy_manager_agent': 'policy_manager',
+    'comparison_agent': 'comparison_agent',
+    'suggestion_agent': 'suggestion_agent',
+    'purchase_agent': 'purchase_agent',
+    'retention_agent': 'retention_agent',
+}
+
+
+def __getattr__(name):
+    import importlib
+    if name in _AGENT_MODULES:
+        mod = importlib.import_module(f".{_AGENT_MODULES[name]}", __name__)
+        value = getattr(mod, name)
+        # Later lookups hit the module dict directly instead of coming back here
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'auth_agent',
@@ -6,15 +6,13 @@ Determines if customer is new or existing and manages the appropriate flow.
 """
 
 from google.adk.agents.llm_agent import Agent
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tools.auth_tools import (
+from ..prompts import COMMON_TONE
+from ..tools.auth_tools import (
     lookup_customer,
     verify_existing_customer,
+    authenticate_customer,
     register_new_customer,
     get_customer_summary
 )
@@ -49,7 +47,8 @@ def lookup_customer_tool(identifier: str) -> dict:
     }
 
 
-def verify_customer_tool(customer_id: str, date_of_birth: str, ssn_last_four: str) -> dict:
+def verify_customer_tool(customer_id: str, date_of_birth: str, ssn_last_four: str,
+                         tool_context: ToolContext) -> dict:
     """
     Verify an existing customer's identity using their date of birth and last 4 SSN digits.
     
@@ -62,6 +61,9 @@ def verify_customer_tool(customer_id: str, date_of_birth: str, ssn_last_four: st
         Verification result with success status and message
     """
     success, message = verify_existing_customer(customer_id, date_of_birth, ssn_last_four)
+    if success:
+        # Marks the session as authenticated for routing
+        tool_context.state["customer_id"] = customer_id
     return {
         "verified": success,
         "message": message,
@@ -69,8 +71,31 @@ def verify_customer_tool(customer_id: str, date_of_birth: str, ssn_last_four: st
     }
 
 
+def authenticate_tool(identifier: str, date_of_birth: str, ssn_last_four: str,
+                      tool_context: ToolContext) -> dict:
+    """
+    Look up and verify an existing customer in a single call.
+    Use this when the customer has already given their identifier, date of birth
+    and last 4 SSN digits.
+    
+    Args:
+        identifier: The customer's email, phone, or policy number
+        date_of_birth: Date of birth in YYYY-MM-DD format
+        ssn_last_four: Last 4 digits of Social Security Number
+        
+    Returns:
+        Whether the customer was found and verified, with their ID and a message
+    """
+    result = authenticate_customer(identifier, date_of_birth, ssn_last_four)
+    if result["verified"]:
+        # Marks the session as authenticated for routing
+        tool_context.state["customer_id"] = result["customer_id"]
+    return result
+
+
 def register_customer_tool(name: str, email: str, phone: str, 
-                           date_of_birth: str, address: str = "") -> dict:
+                           date_of_birth: str, tool_context: ToolContext,
+                           address: str = "") -> dict:
     """
     Register a new customer in the system.
     
@@ -85,8 +110,15 @@ def register_customer_tool(name: str, email: str, phone: str,
         New customer record and welcome message
     """
     customer, message = register_new_customer(name, email, phone, date_of_birth, address)
+    created = "already exists" not in message.lower()
+    if not created:
+        # Existing account: the customer must log in and verify, so don't
+        # authenticate the session or reveal the account's ID
+        return {"success": False, "customer_id": None, "message": message}
+    # Marks the session as authenticated for routing
+    tool_context.state["customer_id"] = customer["id"]
     return {
-        "success": "already exists" not in message.lower(),
+        "success": True,
         "customer_id": customer["id"],
         "message": message
     }
@@ -102,16 +134,13 @@ def get_customer_profile_tool(customer_id: str) -> dict:
     Returns:
         Formatted customer summary
     """
+    # get_customer_summary is memoized on the data write generation, so repeat
+    # calls are cheap and still reflect policy changes made by any agent
     summary = get_customer_summary(customer_id)
     return {"summary": summary}
 
 
-# Create the agent
-auth_agent = Agent(
-    model='gemini-2.5-flash',
-    name='auth_agent',
-    description='Handles customer identification and authentication. Determines if a customer is new or existing and manages verification.',
-    instruction="""You are the Authentication Agent for Aviva Insurance.
+AUTH_INSTRUCTION_STATIC = """You are the Authentication Agent for Aviva Insurance.
     
 Your responsibilities:
 1. Identify customers: Ask for their email, phone, or policy number to look them up
@@ -124,18 +153,31 @@ Flow:
 1. Greet the customer and ask for an identifier (email, phone, or policy number)
 2. Use lookup_customer_tool to check if they exist
 3. If existing: Ask for DOB and last 4 SSN, then verify with verify_customer_tool
+   (if they give identifier, DOB and last 4 SSN together, call authenticate_tool once instead of steps 2-3)
 4. If new: Welcome them and collect their information, then use register_customer_tool
 5. Once verified/registered, provide their profile summary
 
 Tone:
-- Use British English spelling.
 - Be polite and respectful ("Could you please...", "Thank you kindly").
 
-Be formal and professional at all times. Protect customer information.""",
-    tools=[
-        FunctionTool(func=lookup_customer_tool),
-        FunctionTool(func=verify_customer_tool),
-        FunctionTool(func=register_customer_tool),
-        FunctionTool(func=get_customer_profile_tool)
-    ]
+Be formal and professional at all times. Protect customer information.
+""" + COMMON_TONE
+
+
+_AUTH_TOOLS = (
+    FunctionTool(func=lookup_customer_tool),
+    FunctionTool(func=verify_customer_tool),
+    FunctionTool(func=authenticate_tool),
+    FunctionTool(func=register_customer_tool),
+    FunctionTool(func=get_customer_profile_tool),
+)
+
+
+# Create the agent
+auth_agent = Agent(
+    model='gemini-2.5-flash',
+    name='auth_agent',
+    description='Handles customer identification and authentication. Determines if a customer is new or existing and manages verification.',
+    static_instruction=AUTH_INSTRUCTION_STATIC,
+    tools=list(_AUTH_TOOLS)
 )
@@ -8,15 +8,42 @@ Helps customers understand the value of their coverage.
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools import FunctionTool
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from tools.comparison_tools import (
+from ..prompts import COMMON_TONE
+from ..tools.comparison_tools import (
     compare_policies,
     compare_customer_policy,
     get_best_quote
 )
+from ..tools.data_tools import data_version, canonical_policy_id
+from ..tools.results import ComparisonResult
+
+logger = logging.getLogger(__name__)
+
+
+# Comparisons may come from the live quotes API, so cached text is kept for at most 5 minutes
+_COMPARE_TTL_S = 300
+
+
+def _ttl_bucket() -> int:
+    return int(time.monotonic() // _COMPARE_TTL_S)
+
+
+# Read-only comparisons, memoized per data_version of the files they read (any
+# write, in or outside the app, invalidates them) and per TTL bucket
+@lru_cache(maxsize=512)
+def _cached_compare(version: tuple, ttl_bucket: int, policy_type: str, coverage_amount: float,
+                    current_premium: float = None) -> str:
+    return compare_policies(policy_type, coverage_amount, current_premium)
+
+
+@lru_cache(maxsize=512)
+def _cached_compare_customer(version: tuple, ttl_bucket: int, policy_id: str) -> str:
+    return compare_customer_policy(policy_id)
 
 
 def compare_policy_options_tool(policy_type: str, coverage_amount: float, 
@@ -32,7 +59,8 @@ def compare_policy_options_tool(policy_type: str, coverage_amount: float,
     Returns:
         Comparison table showing different providers and rates
     """
-    comparison = compare_policies(policy_type, coverage_amount, current_premium)
+    comparison = _cached_compare(data_version("competitors.json"), _ttl_bucket(),
+                                 policy_type.strip().lower(), float(coverage_amount), current_premium)
     return {"comparison": comparison}
 
 
@@ -48,21 +76,45 @@ def compare_existing_policy_tool(policy_id: str) -> dict:
         Comparison showing how the customer's policy stacks up against competitors
     """
     try:
-        print(f"DEBUG: compare_existing_policy_tool START with {policy_id}")
         # Clean the policy ID - remove any extra spaces and convert to uppercase
-        clean_id = policy_id.strip().upper()
-        print(f"DEBUG: Cleaned ID: {clean_id}")
+        clean_id = canonical_policy_id(policy_id)
         
-        comparison = compare_customer_policy(clean_id)
-        print(f"DEBUG: Comparison result generated ({len(comparison)} chars)")
-        print(f"DEBUG: START RESULT PREVIEW: {comparison[:50]}...")
+        comparison = _cached_compare_customer(
+            data_version("policies.json", "competitors.json"), _ttl_bucket(), clean_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("compare_existing_policy_tool %s -> %d chars: %.50s...",
+                         clean_id, len(comparison), comparison)
         
-        return {"comparison": comparison, "policy_id": clean_id, "status": "success"}
+        return ComparisonResult(comparison, clean_id).to_dict()
     except Exception as e:
-        import traceback
-        error_msg = f"Error comparing policy {policy_id}: {str(e)}\n{traceback.format_exc()}"
-        print(f"DEBUG ERROR: {error_msg}")
-        return {"error": error_msg, "status": "failed"}
+        logger.exception("compare failed for %s", policy_id)
+        return {"error": f"Error comparing policy {policy_id}: {str(e)}", "status": "failed"}
+
+
+def compare_existing_policies_batch_tool(policy_ids: list[str]) -> dict:
+    """
+    Compare several of a customer's existing policies with competitor offerings in one call.
+    Use this instead of repeated compare_existing_policy_tool calls when the customer
+    asks to compare multiple or all of their policies.
+    
+    Args:
+        policy_ids: The policy IDs to compare (e.g., ["POL001", "POL002"])
+        
+    Returns:
+        Comparison per policy ID
+    """
+    ids = list(dict.fromkeys(canonical_policy_id(p) for p in policy_ids))
+    if not ids:
+        return {"comparisons": {}, "status": "success"}
+    version, ttl_bucket = data_version("policies.json", "competitors.json"), _ttl_bucket()
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(ids))) as ex:
+            comparisons = ex.map(lambda pid: _cached_compare_customer(version, ttl_bucket, pid), ids)
+            results = dict(zip(ids, comparisons))
+    except Exception as e:
+        logger.exception("batch compare failed for %s", ids)
+        return {"error": f"Error comparing policies {ids}: {str(e)}", "status": "failed"}
+    return {"comparisons": results, "status": "success"}
 
 
 def get_best_rate_tool(policy_type: str, coverage_amount: float) -> dict:
@@ -76,24 +128,22 @@ def get_best_rate_tool(policy_type: str, coverage_amount: float) -> dict:
     Returns:
         Best available quote with competitor comparison
     """
-    quote = get_best_quote(policy_type, coverage_amount)
+    # get_best_quote is already memoized on the competitors file version
+    quote = get_best_quote(policy_type.strip().lower(), float(coverage_amount))
     if quote:
+        best_competitor = quote['best_competitor']
+        savings = f"£{quote['savings']:.2f}/month"
         return {
             "our_rate": f"£{quote['our_premium']:.2f}/month",
-            "best_competitor": quote['best_competitor'],
+            "best_competitor": best_competitor,
             "competitor_rate": f"£{quote['competitor_premium']:.2f}/month",
-            "your_savings": f"£{quote['savings']:.2f}/month",
-            "message": f"Our rate beats {quote['best_competitor']} by £{quote['savings']:.2f}/month!"
+            "your_savings": savings,
+            "message": f"Our rate beats {best_competitor} by {savings}!"
         }
     return {"error": "Unable to get quotes at this time"}
 
 
-# Create the agent
-comparison_agent = Agent(
-    model='gemini-2.5-flash',
-    name='comparison_agent',
-    description='Compares insurance policies with competitor offerings to show value and savings.',
-    instruction="""You are the Comparison Agent for Aviva Insurance.
+COMPARISON_INSTRUCTION_STATIC = """You are the Comparison Agent for Aviva Insurance.
 
 Your role is to help customers understand how their coverage compares to the market.
 
@@ -101,6 +151,8 @@ Your role is to help customers understand how their coverage compares to the mar
 
 1. **compare_existing_policy_tool(policy_id)** - Use this when customer provides a policy ID (like POL001, POL002). This compares their existing policy with competitors.
 
+   If the customer asks to compare multiple or all of their policies, call **compare_existing_policies_batch_tool(policy_ids)** once with the full list instead of repeated single calls.
+
 2. **compare_policy_options_tool(policy_type, coverage_amount)** - Use this when customer wants to compare options for a NEW policy type.
 
 3. **get_best_rate_tool(policy_type, coverage_amount)** - Use this to show the best available rate for a policy type.
@@ -115,13 +167,23 @@ When a customer provides a policy ID:
 Guidelines:
 - Always present comparisons fairly and transparently
 - Highlight our competitive advantages without disparaging competitors
-- If you receive a policy ID, USE IT with compare_existing_policy_tool right away
 - Present information in clear, professional tables
-- Use British English spelling and tone throughout your responses.
-- Ensure all currency is displayed in GBP (£).""",
-    tools=[
-        FunctionTool(func=compare_policy_options_tool),
-        FunctionTool(func=compare_existing_policy_tool),
-        FunctionTool(func=get_best_rate_tool)
-    ]
+""" + COMMON_TONE
+
+
+_COMPARISON_TOOLS = (
+    FunctionTool(func=compare_policy_options_tool),
+    FunctionTool(func=compare_existing_policy_tool),
+    FunctionTool(func=compare_existing_policies_batch_tool),
+    FunctionTool(func=get_best_rate_tool),
+)
+
+
+# Create the agent
+comparison_agent = Agent(
+    model='gemini-2.5-flash',
+    name='comparison_agent',
+    description='Compares insurance policies with competitor offerings to show value and savings.',
+    static_instruction=COMPARISON_INSTRUCTION_STATIC,
+    tools=list(_COMPARISON_TOOLS)
 )
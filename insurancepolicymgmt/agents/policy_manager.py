@@ -8,17 +8,51 @@ updating, renewing, and cancelling policies.
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools import FunctionTool
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from functools import lru_cache
 
-from tools.policy_tools import (
+from ..prompts import COMMON_TONE
+from ..tools.policy_tools import (
     list_customer_policies,
     renew_policy,
     cancel_policy,
     modify_coverage
 )
-from tools.data_tools import get_policy_by_id, get_policy_details
+from ..tools.data_tools import (
+    DETAIL_FILES, get_policy_by_id, get_policy_with_details, data_version, canonical_policy_id
+)
+
+
+# Read-only lookups, memoized per data_version of the files they read, so both
+# renew/modify/cancel and edits made outside the app invalidate them
+_DETAILS_FILES = ("policies.json", *DETAIL_FILES.values())
+
+
+@lru_cache(maxsize=512)
+def _cached_policy_list(version: tuple, customer_id: str, include_cancelled: bool) -> str:
+    return list_customer_policies(customer_id, include_cancelled)
+
+
+@lru_cache(maxsize=512)
+def _cached_policy_details(version: tuple, policy_id: str) -> dict:
+    row = get_policy_with_details(policy_id)
+    if row is None:
+        return {"error": f"Policy {policy_id} not found"}
+    policy, details = row
+    
+    result = {
+        "policy_id": policy["id"],
+        "type": policy["policy_type"],
+        "status": policy["status"],
+        "coverage": f"£{policy['coverage_amount']:,}",
+        "monthly_premium": f"£{policy['monthly_premium']:.2f}",
+        "start_date": policy["start_date"],
+        "end_date": policy["end_date"]
+    }
+    
+    if details:
+        result["details"] = details
+    
+    return result
 
 
 def list_policies_tool(customer_id: str, include_cancelled: bool = False) -> dict:
@@ -32,7 +66,7 @@ def list_policies_tool(customer_id: str, include_cancelled: bool = False) -> dic
     Returns:
         Formatted list of customer's policies
     """
-    policies_list = list_customer_policies(customer_id, include_cancelled)
+    policies_list = _cached_policy_list(data_version("policies.json"), customer_id.strip(), include_cancelled)
     return {"policies": policies_list}
 
 
@@ -46,26 +80,8 @@ def get_policy_details_tool(policy_id: str) -> dict:
     Returns:
         Complete policy details including type-specific information
     """
-    policy = get_policy_by_id(policy_id)
-    if not policy:
-        return {"error": f"Policy {policy_id} not found"}
-    
-    details = get_policy_details(policy_id, policy["policy_type"])
-    
-    result = {
-        "policy_id": policy["id"],
-        "type": policy["policy_type"],
-        "status": policy["status"],
-        "coverage": f"£{policy['coverage_amount']:,}",
-        "monthly_premium": f"£{policy['monthly_premium']:.2f}",
-        "start_date": policy["start_date"],
-        "end_date": policy["end_date"]
-    }
-    
-    if details:
-        result["details"] = details
-    
-    return result
+    # Shallow copy so callers can't mutate the cached entry
+    return dict(_cached_policy_details(data_version(*_DETAILS_FILES), canonical_policy_id(policy_id)))
 
 
 def renew_policy_tool(policy_id: str, years: int = 1) -> dict:
@@ -110,6 +126,7 @@ def initiate_cancellation_tool(policy_id: str) -> dict:
     Returns:
         Indication that retention offers should be presented
     """
+    policy_id = canonical_policy_id(policy_id)
     policy = get_policy_by_id(policy_id)
     if not policy:
         return {"error": f"Policy {policy_id} not found"}
@@ -121,12 +138,7 @@ def initiate_cancellation_tool(policy_id: str) -> dict:
     }
 
 
-# Create the agent
-policy_manager_agent = Agent(
-    model='gemini-2.5-flash',
-    name='policy_manager_agent',
-    description='Manages insurance policies - list, view details, renew, modify coverage, or initiate cancellation.',
-    instruction="""You are the Policy Manager Agent for Aviva Insurance.
+POLICY_MANAGER_INSTRUCTION_STATIC = """You are the Policy Manager Agent for Aviva Insurance.
 
 Your responsibilities:
 1. List customer policies when requested
@@ -141,14 +153,25 @@ Important guidelines:
 - For cancellations, ALWAYS route to retention first - never process immediately
 - Be helpful in explaining policy details in simple terms
 - Maintain a professional and supportive tone
-- Use British English spelling and currency (£) in all communications.
-
-When a customer wants to cancel, express understanding but let them know you'll check for special offers first.""",
-    tools=[
-        FunctionTool(func=list_policies_tool),
-        FunctionTool(func=get_policy_details_tool),
-        FunctionTool(func=renew_policy_tool),
-        FunctionTool(func=modify_coverage_tool),
-        FunctionTool(func=initiate_cancellation_tool)
-    ]
+
+When a customer wants to cancel, express understanding but let them know you'll check for special offers first.
+""" + COMMON_TONE
+
+
+_POLICY_MANAGER_TOOLS = (
+    FunctionTool(func=list_policies_tool),
+    FunctionTool(func=get_policy_details_tool),
+    FunctionTool(func=renew_policy_tool),
+    FunctionTool(func=modify_coverage_tool),
+    FunctionTool(func=initiate_cancellation_tool),
+)
+
+
+# Create the agent
+policy_manager_agent = Agent(
+    model='gemini-2.5-flash',
+    name='policy_manager_agent',
+    description='Manages insurance policies - list, view details, renew, modify coverage, or initiate cancellation.',
+    static_instruction=POLICY_MANAGER_INSTRUCTION_STATIC,
+    tools=list(_POLICY_MANAGER_TOOLS)
 )
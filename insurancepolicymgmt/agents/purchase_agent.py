@@ -8,12 +8,25 @@ Guides customers through the quote and purchase process.
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools import FunctionTool
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import logging
+from functools import lru_cache
+from types import MappingProxyType
 
-from tools.policy_tools import create_policy
-from tools.comparison_tools import get_best_quote
+from pydantic_core import from_json
+
+from ..prompts import COMMON_TONE
+from ..tools.policy_tools import create_policy
+from ..tools.comparison_tools import get_best_quote
+from ..tools.results import QuoteResult
+from ..tools.metrics import timed_tool
+
+
+logger = logging.getLogger(__name__)
+
+# Fallback monthly rate per £1,000 of cover when no market quote is available;
+# read-only, so it is safe to share between tool calls on any thread
+_BASE_RATES = MappingProxyType({"life": 0.25, "property": 0.40, "vehicle": 1.5})
+_DEFAULT_RATE = 0.30
 
 
 def get_quote_tool(policy_type: str, coverage_amount: float) -> dict:
@@ -29,30 +42,34 @@ def get_quote_tool(policy_type: str, coverage_amount: float) -> dict:
     """
     quote = get_best_quote(policy_type, coverage_amount)
     if quote:
-        return {
-            "policy_type": policy_type.title(),
-            "coverage_amount": f"£{coverage_amount:,}",
-            "monthly_premium": f"£{quote['our_premium']:.2f}",
-            "annual_premium": f"£{quote['our_premium'] * 12:,.2f}",
-            "market_comparison": f"£{quote['savings']:.2f}/month less than {quote['best_competitor']}",
-            "message": "This is a competitive rate! Would you like to proceed with this policy?"
-        }
+        monthly = quote['our_premium']
+        return QuoteResult(
+            policy_type=policy_type.title(),
+            coverage_amount=f"£{coverage_amount:,}",
+            monthly_premium=f"£{monthly:.2f}",
+            annual_premium=f"£{monthly * 12:,.2f}",
+            market_comparison=f"£{quote['savings']:.2f}/month less than {quote['best_competitor']}",
+            message="This is a competitive rate! Would you like to proceed with this policy?"
+        ).to_dict()
     
     # Fallback if comparison fails
-    base_rates = {"life": 0.25, "property": 0.40, "vehicle": 1.5}
-    rate = base_rates.get(policy_type, 0.30)
+    rate = _BASE_RATES.get(policy_type, _DEFAULT_RATE)
     monthly = coverage_amount * rate / 1000
     
-    return {
-        "policy_type": policy_type.title(),
-        "coverage_amount": f"£{coverage_amount:,}",
-        "monthly_premium": f"£{monthly:.2f}",
-        "annual_premium": f"£{monthly * 12:,.2f}",
-        "message": "Would you like to proceed with this policy?"
-    }
+    return QuoteResult(
+        policy_type=policy_type.title(),
+        coverage_amount=f"£{coverage_amount:,}",
+        monthly_premium=f"£{monthly:.2f}",
+        annual_premium=f"£{monthly * 12:,.2f}",
+        message="Would you like to proceed with this policy?"
+    ).to_dict()
 
 
-import json
+# Confirm/retry flows resend the same details string; parse each distinct one once
+@lru_cache(maxsize=256)
+def _parse_details(policy_details_json: str) -> dict:
+    return from_json(policy_details_json)
+
 
 def purchase_policy_tool(customer_id: str, policy_type: str, coverage_amount: float,
                           monthly_premium: float, term_years: int = 1,
@@ -73,9 +90,10 @@ def purchase_policy_tool(customer_id: str, policy_type: str, coverage_amount: fl
     """
     # Parse policy details from JSON string
     try:
-        details = json.loads(policy_details_json)
-    except Exception as e:
-        print(f"Error parsing policy details JSON: {e}")
+        # Copy so create_policy can't mutate the cached entry
+        details = dict(_parse_details(policy_details_json))
+    except (ValueError, TypeError) as e:
+        logger.warning("Error parsing policy details JSON: %s", e)
         details = {}
 
     policy, message = create_policy(
@@ -181,12 +199,7 @@ def collect_vehicle_policy_details_tool(vehicle_vin: str, make: str, model: str,
     }
 
 
-# Create the agent
-purchase_agent = Agent(
-    model='gemini-2.5-flash',
-    name='purchase_agent',
-    description='Handles new policy purchases - provides quotes, collects details, and completes purchases.',
-    instruction="""You are the Purchase Agent for Aviva Insurance.
+PURCHASE_INSTRUCTION_STATIC = """You are the Purchase Agent for Aviva Insurance.
 
 You guide customers through the policy purchase process.
 
@@ -207,14 +220,26 @@ Guidelines:
 - Highlight competitive rates and savings
 - Confirm all details before finalizing purchase
 - Celebrate with them when purchase is complete!
-- Use British English spelling (e.g., 'cheque', 'centre') and tone.
-
-Always ensure the customer understands what they're buying and feels confident in their decision.""",
-    tools=[
-        FunctionTool(func=get_quote_tool),
-        FunctionTool(func=purchase_policy_tool),
-        FunctionTool(func=collect_life_policy_details_tool),
-        FunctionTool(func=collect_property_policy_details_tool),
-        FunctionTool(func=collect_vehicle_policy_details_tool)
-    ]
+
+Always ensure the customer understands what they're buying and feels confident in their decision.
+""" + COMMON_TONE
+
+
+# Each tool is timed; latencies go to tool_metrics()
+_PURCHASE_TOOLS = (
+    FunctionTool(func=timed_tool(get_quote_tool)),
+    FunctionTool(func=timed_tool(purchase_policy_tool)),
+    FunctionTool(func=timed_tool(collect_life_policy_details_tool)),
+    FunctionTool(func=timed_tool(collect_property_policy_details_tool)),
+    FunctionTool(func=timed_tool(collect_vehicle_policy_details_tool)),
+)
+
+
+# Create the agent
+purchase_agent = Agent(
+    model='gemini-2.5-flash',
+    name='purchase_agent',
+    description='Handles new policy purchases - provides quotes, collects details, and completes purchases.',
+    static_instruction=PURCHASE_INSTRUCTION_STATIC,
+    tools=list(_PURCHASE_TOOLS)
 )
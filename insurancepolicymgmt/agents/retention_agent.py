@@ -6,23 +6,74 @@ Handles customer retention when they attempt to cancel policies.
 Presents offers and incentives to keep customers.
 """
 
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import Agent
-from google.adk.tools import FunctionTool
-
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tools.retention_tools import (
-    present_retention_offers,
+from google.adk.tools import FunctionTool, ToolContext
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from ..prompts import COMMON_TONE
+from ..tools.data_tools import data_generation
+from ..tools.results import OfferResult
+from ..tools.metrics import timed_tool
+from ..tools.retention_tools import (
+    customer_value_bracket,
+    retention_offers_for_bracket,
+    format_retention_offers,
     apply_retention_offer,
     get_cancellation_reasons,
     process_cancellation_with_reason,
     calculate_loyalty_score
 )
 
+logger = logging.getLogger(__name__)
+
+# Offers are also edited outside the app, so cached text is kept for at most an hour
+_OFFERS_TTL_S = 3600
+
+
+# The offer list depends only on the customer's value bracket, so every customer
+# in a bracket shares one entry; any data write invalidates it via the generation
+@lru_cache(maxsize=16)
+def _cached_offers_text(generation: int, ttl_bucket: int, bracket: str) -> str:
+    return format_retention_offers(retention_offers_for_bracket(bracket))
+
+
+def _offers_text(customer_id: str) -> str:
+    bracket = customer_value_bracket(customer_id)
+    if bracket is None:
+        return format_retention_offers([])
+    return _cached_offers_text(data_generation(), int(time.monotonic() // _OFFERS_TTL_S), bracket)
+
 
-def present_offers_tool(customer_id: str, policy_id: str) -> dict:
+# invocation_id -> (customer_id, offers text being computed since the agent was entered).
+# Keyed per invocation so concurrent sessions for one customer don't take each other's task
+_prefetched: dict[str, tuple[str, asyncio.Task]] = {}
+
+
+def prefetch_offers(callback_context: CallbackContext) -> None:
+    """before_agent_callback: start reading the customer's offers while the model writes its reply."""
+    customer_id = callback_context.state.get("customer_id")
+    if customer_id:
+        _drop_prefetch(callback_context)
+        _prefetched[callback_context.invocation_id] = (customer_id, asyncio.get_running_loop().create_task(
+            asyncio.to_thread(_offers_text, customer_id)
+        ))
+    return None
+
+
+def _drop_prefetch(callback_context: CallbackContext) -> None:
+    """after_agent_callback: discard an unused prefetch once the agent has finished."""
+    entry = _prefetched.pop(callback_context.invocation_id, None)
+    if entry is not None:
+        entry[1].cancel()
+    return None
+
+
+async def present_offers_tool(customer_id: str, policy_id: str, tool_context: ToolContext) -> dict:
     """
     Present retention offers to a customer considering cancellation.
     
@@ -33,8 +84,18 @@ def present_offers_tool(customer_id: str, policy_id: str) -> dict:
     Returns:
         Formatted retention offers
     """
-    offers = present_retention_offers(customer_id, policy_id)
-    return {"offers": offers}
+    customer_id = customer_id.strip()
+    entry = _prefetched.pop(tool_context.invocation_id, None)
+    if entry is not None:
+        prefetched_for, task = entry
+        if prefetched_for == customer_id:
+            try:
+                return {"offers": await task}
+            except Exception:
+                logger.exception("Prefetching offers for %s failed; computing them again", customer_id)
+        else:
+            task.cancel()
+    return {"offers": await asyncio.to_thread(_offers_text, customer_id)}
 
 
 def apply_offer_tool(customer_id: str, policy_id: str, offer_id: str) -> dict:
@@ -49,8 +110,7 @@ def apply_offer_tool(customer_id: str, policy_id: str, offer_id: str) -> dict:
     Returns:
         Confirmation of applied offer with new terms
     """
-    success, message = apply_retention_offer(customer_id, policy_id, offer_id)
-    return {"success": success, "message": message}
+    return OfferResult(*apply_retention_offer(customer_id, policy_id, offer_id)).to_dict()
 
 
 def get_cancellation_reasons_tool() -> dict:
@@ -99,12 +159,7 @@ def get_customer_value_tool(customer_id: str) -> dict:
     }
 
 
-# Create the agent
-retention_agent = Agent(
-    model='gemini-2.5-flash',
-    name='retention_agent',
-    description='Retains customers who want to cancel by presenting personalized offers and incentives.',
-    instruction="""You are the Retention Agent for Aviva Insurance.
+RETENTION_INSTRUCTION_STATIC = """You are the Retention Agent for Aviva Insurance.
 
 Your mission is to retain customers who are considering cancellation.
 
@@ -128,15 +183,29 @@ Guidelines:
 - For high-value customers (Gold/Platinum tier), offer the best deals
 - If they insist on cancelling, process it gracefully
 - Always end positively, leaving the door open for return
-- Use British English spelling and polite phrasing.
 
 Remember: A customer who leaves feeling respected may come back. 
-A customer who feels pressured never will.""",
-    tools=[
-        FunctionTool(func=present_offers_tool),
-        FunctionTool(func=apply_offer_tool),
-        FunctionTool(func=get_cancellation_reasons_tool),
-        FunctionTool(func=process_cancellation_tool),
-        FunctionTool(func=get_customer_value_tool)
-    ]
+A customer who feels pressured never will.
+""" + COMMON_TONE
+
+
+# Each tool is timed; latencies go to tool_metrics()
+_RETENTION_TOOLS = (
+    FunctionTool(func=timed_tool(present_offers_tool)),
+    FunctionTool(func=timed_tool(apply_offer_tool)),
+    FunctionTool(func=timed_tool(get_cancellation_reasons_tool)),
+    FunctionTool(func=timed_tool(process_cancellation_tool)),
+    FunctionTool(func=timed_tool(get_customer_value_tool)),
+)
+
+
+# Create the agent
+retention_agent = Agent(
+    model='gemini-2.5-flash',
+    name='retention_agent',
+    description='Retains customers who want to cancel by presenting personalized offers and incentives.',
+    static_instruction=RETENTION_INSTRUCTION_STATIC,
+    before_agent_callback=prefetch_offers,
+    after_agent_callback=_drop_prefetch,
+    tools=list(_RETENTION_TOOLS)
 )
@@ -8,14 +8,15 @@ situations, life events, and coverage gaps.
 from google.adk.agents.llm_agent import Agent
 from google.adk.tools import FunctionTool
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import asyncio
 
-from tools.suggestion_tools import (
+from ..prompts import COMMON_TONE
+from ..tools.metrics import timed_tool
+from ..tools.suggestion_tools import (
     get_recommendations,
     suggest_for_new_customer,
     analyze_life_events,
+    event_display_name,
     get_coverage_gaps
 )
 
@@ -60,13 +61,16 @@ def check_life_events_tool(customer_id: str) -> dict:
     Returns:
         List of relevant life events with recommendations
     """
-    events = analyze_life_events(customer_id)
+    return _events_result(analyze_life_events(customer_id))
+
+
+def _events_result(events: list[dict]) -> dict:
     if events:
         return {
             "events_found": len(events),
             "events": [
                 {
-                    "type": e["event_type"].replace("_", " ").title(),
+                    "type": event_display_name(e["event_type"]),
                     "date": e["event_date"],
                     "days_until": e["days_until"],
                     "recommendations": [r["policy_type"] for r in e["recommendations"]]
@@ -87,7 +91,10 @@ def identify_coverage_gaps_tool(customer_id: str) -> dict:
     Returns:
         List of missing policy types with recommendations
     """
-    gaps = get_coverage_gaps(customer_id)
+    return _gaps_result(get_coverage_gaps(customer_id))
+
+
+def _gaps_result(gaps: list[dict]) -> dict:
     if gaps:
         return {
             "gaps_found": len(gaps),
@@ -104,12 +111,27 @@ def identify_coverage_gaps_tool(customer_id: str) -> dict:
     return {"gaps_found": 0, "message": "Customer has comprehensive coverage across all policy types."}
 
 
-# Create the agent
-suggestion_agent = Agent(
-    model='gemini-2.5-flash',
-    name='suggestion_agent',
-    description='Provides intelligent policy recommendations based on life events, coverage gaps, and customer situations.',
-    instruction="""You are the Suggestion Agent for Aviva Insurance.
+async def get_full_profile_tool(customer_id: str) -> dict:
+    """
+    Run the full analysis for an existing customer in one call: life events,
+    coverage gaps and personalized recommendations.
+    
+    Args:
+        customer_id: The customer's ID
+        
+    Returns:
+        Life events, coverage gaps and recommendations
+    """
+    # Independent file-backed reads, so run them side by side off the event loop
+    events, gaps, recs = await asyncio.gather(
+        asyncio.to_thread(analyze_life_events, customer_id),
+        asyncio.to_thread(get_coverage_gaps, customer_id),
+        asyncio.to_thread(get_recommendations, customer_id),
+    )
+    return {"events": _events_result(events), "gaps": _gaps_result(gaps), "recs": recs}
+
+
+SUGGESTION_INSTRUCTION_STATIC = """You are the Suggestion Agent for Aviva Insurance.
 
 Your mission is to proactively help customers identify coverage they may need.
 
@@ -126,6 +148,8 @@ Guidelines:
 - Prioritize recommendations by urgency (high/medium/low)
 - For life events, be sensitive to the customer's situation
 - Always tie recommendations to their specific circumstances
+- For a full analysis of an existing customer, call get_full_profile_tool once
+  instead of the individual life event, gap and recommendation tools
 
 When discussing life events:
 - Marriage → Suggest life insurance to protect spouse
@@ -133,12 +157,24 @@ When discussing life events:
 - Child turning 18 → Suggest vehicle insurance for new drivers
 - Home purchase → Suggest property insurance
 - Retirement → Review and potentially adjust life insurance
+""" + COMMON_TONE
+
+
+# Each tool is timed; latencies go to tool_metrics()
+_SUGGESTION_TOOLS = (
+    FunctionTool(func=timed_tool(get_full_profile_tool)),
+    FunctionTool(func=timed_tool(get_personalized_recommendations_tool)),
+    FunctionTool(func=timed_tool(get_new_customer_suggestions_tool)),
+    FunctionTool(func=timed_tool(check_life_events_tool)),
+    FunctionTool(func=timed_tool(identify_coverage_gaps_tool)),
+)
 
-Use British English spelling and tone in all recommendations.""",
-    tools=[
-        FunctionTool(func=get_personalized_recommendations_tool),
-        FunctionTool(func=get_new_customer_suggestions_tool),
-        FunctionTool(func=check_life_events_tool),
-        FunctionTool(func=identify_coverage_gaps_tool)
-    ]
+
+# Create the agent
+suggestion_agent = Agent(
+    model='gemini-2.5-flash',
+    name='suggestion_agent',
+    description='Provides intelligent policy recommendations based on life events, coverage gaps, and customer situations.',
+    static_instruction=SUGGESTION_INSTRUCTION_STATIC,
+    tools=list(_SUGGESTION_TOOLS)
 )
@@ -0,0 +1,74 @@
+"""
+Streaming Console Chat
+======================
+Runs the root agent in-process with an InMemoryRunner and prints the reply
+as it is generated, instead of waiting for each full response.
+
+Usage (from the repository root):
+    python -m insurancepolicymgmt.chat
+
+Type /metrics to print recorded tool latencies.
+"""
+
+import asyncio
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .agent import root_agent
+from .tools.data_tools import flush
+from .tools.metrics import tool_metrics
+
+APP_NAME = "insurancepolicymgmt"
+USER_ID = "console_user"
+
+# SSE streaming: the model's text arrives as partial events, so the first tokens show at TTFT
+_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+async def main():
+    runner = InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+
+    while True:
+        try:
+            text = await asyncio.to_thread(input, "\nYou: ")
+        except EOFError:
+            break
+        if text.strip().lower() in ("exit", "quit"):
+            break
+        if text.strip() == "/metrics":
+            for name, stats in tool_metrics().items():
+                print(f"{name}: {stats}")
+            continue
+
+        streamed = False
+        async for event in runner.run_async(
+            user_id=USER_ID,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+            run_config=_RUN_CONFIG,
+        ):
+            if not event.content or not event.content.parts:
+                continue
+            chunk = "".join(p.text for p in event.content.parts if p.text)
+            if event.partial:
+                print(chunk, end="", flush=True)
+                streamed = True
+            elif not streamed and chunk:
+                # Non-streamed text (e.g. a reply with no partials before it)
+                print(chunk, end="", flush=True)
+            else:
+                # The final aggregated event repeats what was already streamed
+                streamed = False
+        print()
+        # Turn finished: wait for its queued saves so they're on disk before the next prompt
+        try:
+            await asyncio.to_thread(flush)
+        except OSError as e:
+            print(f"Warning: some changes from this turn could not be saved ({e}).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
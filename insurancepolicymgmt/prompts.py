@@ -0,0 +1,26 @@
+"""
+Shared Prompt Fragments
+=======================
+Text used by more than one agent instruction, kept in one place so each
+prompt carries it once and stays short.
+"""
+
+# Appended once to every agent instruction
+COMMON_TONE = "Use British English; currency in GBP (£)."
+
+# Root routing rules - agent names and descriptions are already supplied by ADK's transfer tool
+ROUTING_RULES = """Routing:
+- Identify the customer via auth_agent before anything touching their policies.
+- Cancellations ALWAYS go to retention_agent first.
+- A full review of their cover goes to review_fanout, not comparison_agent then suggestion_agent.
+- A bare policy ID (e.g. "POL002") follows the current topic: comparison -> comparison_agent,
+  cancellation -> retention_agent, renewal/details -> policy_manager_agent; otherwise ask."""
+
+# Few-shot routing examples, only added for short messages that need context to route
+FEW_SHOT_EXAMPLES = [
+    '"I want to see my policies" -> auth_agent (if not authenticated) -> policy_manager_agent',
+    '"Compare my car insurance" -> auth_agent -> comparison_agent',
+    '"I want to buy life insurance" -> auth_agent -> purchase_agent',
+    '"Cancel my policy" -> auth_agent -> retention_agent',
+    '"My daughter is turning 18" -> auth_agent -> suggestion_agent',
+]
@@ -0,0 +1,152 @@
+"""
+Routing Cache
+=============
+Remembers which sub-agent the root agent transferred to for a customer's
+opening message, so a repeat of the same request skips the routing LLM call.
+Later messages depend on the conversation so far ("the second one please")
+and are always routed by the model.
+A few unambiguous intents (cancel, compare a policy ID, list policies) are
+routed by pattern for authenticated customers without ever calling the model.
+
+Messages are normalized (case, punctuation, common abbreviations, filler
+words) so simple paraphrases share an entry. Word order is kept, since
+"renew then cancel" and "cancel then renew" are different requests. Keys
+also record whether the session is authenticated, since the same request
+routes to auth_agent first for anonymous customers.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from .prompts import FEW_SHOT_EXAMPLES
+
+_MAX_ENTRIES = 1024
+# Short replies ("yes", "POL002") only make sense in context, so they always go to the LLM
+_MIN_WORDS = 3
+_STATE_KEY = "temp:routing_cache_key"
+
+_FEW_SHOT_TEXT = "Examples:\n" + "\n".join(f"- {e}" for e in FEW_SHOT_EXAMPLES)
+
+# Unambiguous requests from an authenticated customer, routed without the model.
+# Checked in order against the raw message; anything with a negation, or a
+# cancellation not phrased as a direct request, goes to the LLM instead.
+_NEGATION_RE = re.compile(r"\b(?:not|no|never|don['’]?t|do not)\b|n['’]t\b", re.I)
+_FAST_PATHS = (
+    (re.compile(
+        r"^\s*(?:please\s+)?(?:(?:i\s+(?:want|need|would\s+like)|i['’]d\s+like)\s+to\s+)?"
+        r"(?:cancel|terminate)\s+(?:my|the)\s+(?:\w+\s+){0,2}?(?:policy|cover|insurance)\b",
+        re.I), "retention_agent"),
+    (re.compile(r"\bcompare\b.*\bPOL\d+\b", re.I), "comparison_agent"),
+    (re.compile(r"\b(list|show|see|view)\b.*\bmy policies\b", re.I), "policy_manager_agent"),
+)
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_ABBREVIATIONS = {
+    "pls": "please",
+    "plz": "please",
+    "ins": "insurance",
+    "u": "you",
+    "ur": "your",
+}
+
+# Words that don't change where a request is routed ("I want to cancel my policy"
+# and "please cancel my policy" are the same request)
+_FILLER = frozenset((
+    "a", "an", "the", "i", "d", "m", "me", "to", "would", "like", "want",
+    "please", "can", "could", "you", "just", "hi", "hello", "thanks", "thank",
+))
+
+_routes: OrderedDict = OrderedDict()
+
+
+def _normalize(text: str) -> str:
+    words = _NON_WORD_RE.sub(" ", text.lower()).split()
+    return " ".join(_ABBREVIATIONS.get(w, w) for w in words)
+
+
+def _content_key(normalized: str) -> str:
+    """Content words of a normalized message, in order, used as the cache key."""
+    return " ".join(w for w in normalized.split() if w not in _FILLER)
+
+
+def _last_user_text(llm_request: LlmRequest) -> Optional[str]:
+    """Text of the newest user turn, or None if it isn't plain text (e.g. a tool result)."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts or any(not p.text for p in last.parts):
+        return None
+    return " ".join(p.text for p in last.parts)
+
+
+def _is_first_turn(llm_request: LlmRequest) -> bool:
+    """True if the model hasn't replied yet in this conversation."""
+    return not any(c.role == "model" for c in llm_request.contents[:-1])
+
+
+def _transfer(agent_name: str) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(
+                name="transfer_to_agent", args={"agent_name": agent_name}
+            ))],
+        )
+    )
+
+
+def route_from_cache(callback_context: CallbackContext,
+                     llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback: answer with a cached transfer instead of calling the model."""
+    callback_context.state[_STATE_KEY] = None
+    text = _last_user_text(llm_request)
+    if not text:
+        return None
+    if callback_context.state.get('customer_id') is not None and not _NEGATION_RE.search(text):
+        for pattern, agent_name in _FAST_PATHS:
+            if pattern.search(text):
+                return _transfer(agent_name)
+    normalized = _normalize(text)
+    if len(normalized.split()) < _MIN_WORDS:
+        # Context-dependent reply: the only case where routing examples are worth their tokens
+        llm_request.append_instructions([_FEW_SHOT_TEXT])
+        return None
+
+    # Only opening messages are cached; anything later is read in context
+    if not _is_first_turn(llm_request):
+        return None
+    content = _content_key(normalized)
+    if not content:
+        return None
+    key = f"{callback_context.state.get('customer_id') is None}|{content}"
+    agent_name = _routes.get(key)
+    if agent_name is not None:
+        _routes.move_to_end(key)
+        return _transfer(agent_name)
+
+    callback_context.state[_STATE_KEY] = key
+    return None
+
+
+def remember_route(callback_context: CallbackContext,
+                   llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """after_model_callback: store the sub-agent the model chose for this message."""
+    key = callback_context.state.get(_STATE_KEY)
+    if not key or not llm_response.content or not llm_response.content.parts:
+        return None
+
+    for part in llm_response.content.parts:
+        call = part.function_call
+        if call and call.name == "transfer_to_agent" and call.args:
+            _routes[key] = call.args.get("agent_name")
+            _routes.move_to_end(key)
+            if len(_routes) > _MAX_ENTRIES:
+                _routes.popitem(last=False)
+            callback_context.state[_STATE_KEY] = None
+            break
+    return None
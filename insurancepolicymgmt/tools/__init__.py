@@ -4,63 +4,85 @@ Tools Package Initializer
 Exports all tool functions for use by agents.
 """
 
-# Data Tools
-from tools.data_tools import (
-    load_json,
-    save_json,
-    get_customer_by_id,
-    get_customer_by_email,
-    get_customer_by_phone,
-    get_policies_by_customer,
-    get_policy_by_id,
-    get_policy_details,
-    get_life_events_by_customer,
-    get_offers,
-    get_competitors,
-    add_customer,
-    add_transaction
-)
+# Tool modules are imported on first attribute access (PEP 562). Agents import
+# `tools.<module>` directly, and that no longer drags in every sibling module.
+_TOOL_MODULES = {
+    'load_json': 'data_tools',
+    'load_json_find': 'data_tools',
+    'save_json': 'data_tools',
+    'patch_row': 'data_tools',
+    'next_id': 'data_tools',
+    'batch_writes': 'data_tools',
+    'flush': 'data_tools',
+    'operation_clock': 'data_tools',
+    'read_snapshot': 'data_tools',
+    'data_generation': 'data_tools',
+    'file_version': 'data_tools',
+    'data_version': 'data_tools',
+    'get_customer_by_id': 'data_tools',
+    'get_customer_by_email': 'data_tools',
+    'get_customer_by_phone': 'data_tools',
+    'normalize_phone': 'data_tools',
+    'get_policies_by_customer': 'data_tools',
+    'active_policy_summary': 'data_tools',
+    'PolicySummary': 'data_tools',
+    'get_policy_by_id': 'data_tools',
+    'canonical_policy_id': 'data_tools',
+    'get_policy_details': 'data_tools',
+    'get_policy_with_details': 'data_tools',
+    'customers_by_email_and_phone': 'data_tools',
+    'get_competitor_quotes_by_type': 'data_tools',
+    'get_life_events_by_customer': 'data_tools',
+    'get_offers': 'data_tools',
+    'get_offer_by_id': 'data_tools',
+    'get_competitors': 'data_tools',
+    'add_customer': 'data_tools',
+    'add_transaction': 'data_tools',
+    'lookup_customer': 'auth_tools',
+    'verify_existing_customer': 'auth_tools',
+    'register_new_customer': 'auth_tools',
+    'get_customer_summary': 'auth_tools',
+    'create_policy': 'policy_tools',
+    'update_policy': 'policy_tools',
+    'renew_policy': 'policy_tools',
+    'cancel_policy': 'policy_tools',
+    'modify_coverage': 'policy_tools',
+    'list_customer_policies': 'policy_tools',
+    'compare_policies': 'comparison_tools',
+    'compare_customer_policy': 'comparison_tools',
+    'get_best_quote': 'comparison_tools',
+    'analyze_life_events': 'suggestion_tools',
+    'get_coverage_gaps': 'suggestion_tools',
+    'get_recommendations': 'suggestion_tools',
+    'mark_event_processed': 'suggestion_tools',
+    'suggest_for_new_customer': 'suggestion_tools',
+    'get_retention_offers': 'retention_tools',
+    'present_retention_offers': 'retention_tools',
+    'apply_retention_offer': 'retention_tools',
+    'get_cancellation_reasons': 'retention_tools',
+    'process_cancellation_with_reason': 'retention_tools',
+    'calculate_loyalty_score': 'retention_tools',
+    'ComparisonResult': 'results',
+    'QuoteResult': 'results',
+    'OfferResult': 'results',
+    'timed_tool': 'metrics',
+    'tool_metrics': 'metrics',
+}
 
-# Authentication Tools
-from tools.auth_tools import (
-    lookup_customer,
-    verify_existing_customer,
-    register_new_customer,
-    get_customer_summary
-)
 
-# Policy Tools
-from tools.policy_tools import (
-    create_policy,
-    update_policy,
-    renew_policy,
-    cancel_policy,
-    modify_coverage,
-    list_customer_policies
-)
+def __getattr__(name):
+    import importlib
+    if name in _TOOL_MODULES:
+        mod = importlib.import_module(f".{_TOOL_MODULES[name]}", __name__)
+        value = getattr(mod, name)
+        # Later lookups hit the module dict directly instead of coming back here
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Comparison Tools
-from tools.comparison_tools import (
-    compare_policies,
-    compare_customer_policy,
-    get_best_quote
-)
 
-# Suggestion Tools
-from tools.suggestion_tools import (
-    analyze_life_events,
-    get_coverage_gaps,
-    get_recommendations,
-    mark_event_processed,
-    suggest_for_new_customer
-)
+def __dir__():
+    return sorted(set(globals()) | set(_TOOL_MODULES))
 
-# Retention Tools
-from tools.retention_tools import (
-    get_retention_offers,
-    present_retention_offers,
-    apply_retention_offer,
-    get_cancellation_reasons,
-    process_cancellation_with_reason,
-    calculate_loyalty_score
-)
+
+__all__ = list(_TOOL_MODULES)
@@ -5,15 +5,29 @@ Handles customer identification, verification, and registration.
 Implements differentiated authentication flows for new vs existing customers.
 """
 
+import re
+from functools import lru_cache
 from typing import Optional, Tuple
-from tools.data_tools import (
+from .data_tools import (
+    DATA_DIR,
+    data_generation,
     get_customer_by_email,
     get_customer_by_phone,
+    customers_by_email_and_phone,
+    normalize_phone,
     get_policy_by_id,
     get_customer_by_id,
     add_customer
 )
 
+# Classifies an identifier in one anchored match; m.lastgroup names the kind
+_ID_RE = re.compile(
+    r'^(?P<email>[^@\s]+@[^@\s]+)$'
+    r'|^(?P<phone>\+?\d[\d\- ]{6,})$'
+    r'|^(?P<policy>POL[A-Z0-9]+)$',
+    re.I
+)
+
 
 def lookup_customer(identifier: str) -> Tuple[Optional[dict], str]:
     """
@@ -27,21 +41,22 @@ def lookup_customer(identifier: str) -> Tuple[Optional[dict], str]:
         Tuple of (customer_dict or None, identifier_type)
         identifier_type is one of: 'email', 'phone', 'policy', 'not_found'
     """
-    # Try email lookup first
-    if "@" in identifier:
+    identifier = identifier.strip()
+    m = _ID_RE.match(identifier)
+    kind = m.lastgroup if m else None
+    
+    if kind == "email":
         customer = get_customer_by_email(identifier)
         if customer:
             return customer, "email"
     
-    # Try phone lookup (check for phone-like pattern)
-    if any(c.isdigit() for c in identifier) and "-" in identifier:
+    elif kind == "phone":
         customer = get_customer_by_phone(identifier)
         if customer:
             return customer, "phone"
     
-    # Try policy lookup
-    if identifier.upper().startswith("POL"):
-        policy = get_policy_by_id(identifier.upper())
+    elif kind == "policy":
+        policy = get_policy_by_id(identifier)
         if policy:
             customer = get_customer_by_id(policy["customer_id"])
             if customer:
@@ -79,6 +94,36 @@ def verify_existing_customer(customer_id: str, dob: str, ssn_last4: str) -> Tupl
     return True, f"Welcome back, {customer['name']}! Your identity has been verified."
 
 
+def authenticate_customer(identifier: str, dob: str, ssn_last4: str) -> dict:
+    """
+    Look up and verify an existing customer in one step.
+    
+    Args:
+        identifier: Email address, phone number, or policy ID
+        dob: Date of birth in YYYY-MM-DD format
+        ssn_last4: Last 4 digits of SSN
+        
+    Returns:
+        Dictionary with found, verified, customer_id and message
+    """
+    customer, _ = lookup_customer(identifier)
+    if not customer:
+        return {
+            "found": False,
+            "verified": False,
+            "customer_id": None,
+            "message": "No customer found with this information. This appears to be a new customer."
+        }
+    
+    success, message = verify_existing_customer(customer["id"], dob, ssn_last4)
+    return {
+        "found": True,
+        "verified": success,
+        "customer_id": customer["id"] if success else None,
+        "message": message
+    }
+
+
 def register_new_customer(name: str, email: str, phone: str, dob: str, 
                           address: str = "", ssn_last4: str = "") -> Tuple[dict, str]:
     """
@@ -95,13 +140,16 @@ def register_new_customer(name: str, email: str, phone: str, dob: str,
     Returns:
         Tuple of (customer_record, welcome_message)
     """
+    # One read of customers.json for both duplicate checks
+    by_email, by_phone = customers_by_email_and_phone()
+    
     # Check if email already exists
-    existing = get_customer_by_email(email)
+    existing = by_email.get(email.lower())
     if existing:
         return existing, f"An account with email {email} already exists. Please log in instead."
     
     # Check if phone already exists
-    existing = get_customer_by_phone(phone)
+    existing = by_phone.get(normalize_phone(phone))
     if existing:
         return existing, f"An account with phone {phone} already exists. Please log in instead."
     
@@ -138,14 +186,31 @@ def get_customer_summary(customer_id: str) -> str:
     Returns:
         Formatted string with customer summary
     """
-    from tools.data_tools import get_policies_by_customer
+    # Keyed on the write generation (saves still queued for disk) and both files'
+    # mtimes (edits made outside this process)
+    return _summary(
+        customer_id,
+        data_generation(),
+        (DATA_DIR / "customers.json").stat().st_mtime_ns,
+        (DATA_DIR / "policies.json").stat().st_mtime_ns,
+    )
+
+
+@lru_cache(maxsize=512)
+def _summary(customer_id: str, generation: int, cust_mtime: int, pol_mtime: int) -> str:
+    from .data_tools import get_policies_by_customer
     
     customer = get_customer_by_id(customer_id)
     if not customer:
         return "Customer not found."
     
     policies = get_policies_by_customer(customer_id)
-    active_policies = [p for p in policies if p["status"] == "active"]
+    
+    # One pass: count active policies and build their coverage lines together
+    coverage_lines = [
+        f"- {p['policy_type'].title()}: ${p['coverage_amount']:,.0f} coverage"
+        for p in policies if p["status"] == "active"
+    ]
     
     summary = f"""
 **Customer Profile**
@@ -156,12 +221,10 @@ def get_customer_summary(customer_id: str) -> str:
 
 **Policy Summary**
 - Total Policies: {len(policies)}
-- Active Policies: {len(active_policies)}
+- Active Policies: {len(coverage_lines)}
 """
     
-    if active_policies:
-        summary += "\n**Active Coverage:**\n"
-        for policy in active_policies:
-            summary += f"- {policy['policy_type'].title()}: ${policy['coverage_amount']:,.0f} coverage\n"
+    if coverage_lines:
+        summary += "\n**Active Coverage:**\n" + "\n".join(coverage_lines)
     
     return summary.strip()
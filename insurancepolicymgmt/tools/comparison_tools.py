@@ -6,8 +6,11 @@ Supports real API integration with fallback to synthetic data.
 """
 
 import os
+from functools import lru_cache
+from math import fsum
+from operator import itemgetter
 from typing import Optional
-from tools.data_tools import get_competitors, get_policy_by_id
+from .data_tools import file_version, get_competitor_quotes_by_type, get_policy_by_id
 
 
 def compare_policies(policy_type: str, coverage_amount: float, 
@@ -34,6 +37,14 @@ def compare_policies(policy_type: str, coverage_amount: float,
             return _format_comparison(api_data, policy_type, coverage_amount, our_premium)
     
     # Fall back to synthetic data
+    return _cached_synthetic(policy_type, coverage_amount, our_premium, file_version("competitors.json"))
+
+
+# Synthetic comparisons are pure given the competitor table; the file version in
+# the key drops stale entries when competitors.json changes
+@lru_cache(maxsize=256)
+def _cached_synthetic(policy_type: str, coverage_amount: float,
+                      our_premium: Optional[float], version) -> str:
     return _compare_with_synthetic(policy_type, coverage_amount, our_premium)
 
 
@@ -75,28 +86,33 @@ def _compare_with_synthetic(policy_type: str, coverage_amount: float,
     Returns:
         Formatted comparison string
     """
-    competitors = get_competitors()
-    comparison_data = []
-    
-    for competitor in competitors:
-        for policy in competitor["policies"]:
-            if policy["policy_type"] == policy_type:
-                # Scale premium based on coverage difference
-                base_coverage = policy["coverage_amount"]
-                base_premium = policy["monthly_premium"]
-                
-                # Simple linear scaling for demo purposes
-                scaled_premium = round(base_premium * (coverage_amount / base_coverage), 2)
-                
-                comparison_data.append({
-                    "provider": competitor["provider"],
-                    "premium": scaled_premium,
-                    "features": policy.get("features", [])
-                })
+    quotes, premiums = _scaled_premiums(policy_type, coverage_amount)
+    comparison_data = [
+        {"provider": provider, "premium": premium, "features": features}
+        for (provider, _, _, features), premium in zip(quotes, premiums)
+    ]
     
     return _format_comparison(comparison_data, policy_type, coverage_amount, our_premium)
 
 
+def _scaled_premiums(policy_type: str, coverage_amount: float) -> tuple[tuple[tuple, ...], list[float]]:
+    """
+    Scale every competitor's base premium for a policy type to the requested coverage.
+    
+    Args:
+        policy_type: Type of policy
+        coverage_amount: Desired coverage amount
+        
+    Returns:
+        Tuple of (competitor quote tuples, scaled premiums in the same order)
+    """
+    quotes = get_competitor_quotes_by_type(policy_type)
+    # Simple linear scaling for demo purposes, one pass over the flat table
+    premiums = [round(base_premium * (coverage_amount / base_coverage), 2)
+                for _, base_coverage, base_premium, _ in quotes]
+    return quotes, premiums
+
+
 def _format_comparison(data: list, policy_type: str, coverage_amount: float,
                        our_premium: Optional[float] = None) -> str:
     """
@@ -111,44 +127,52 @@ def _format_comparison(data: list, policy_type: str, coverage_amount: float,
     Returns:
         Formatted comparison string
     """
-    # Sort by premium (lowest first)
-    data.sort(key=lambda x: x["premium"])
+    # Market stats straight from the premiums; sorting is only needed for display order
+    premiums = [item["premium"] for item in data]
+    if premiums:
+        # First lowest and last highest, matching data[0] / data[-1] after a stable sort
+        lowest = data[min(range(len(premiums)), key=premiums.__getitem__)]
+        highest = data[max(reversed(range(len(premiums))), key=premiums.__getitem__)]
+        avg_premium = fsum(premiums) / len(premiums)
     
-    result = f"## {policy_type.title()} Insurance Comparison\n"
-    result += f"**Coverage Amount:** £{coverage_amount:,.0f}\n\n"
+    # Sort by premium (lowest first)
+    data.sort(key=itemgetter("premium"))
     
-    # Build comparison table
-    result += "| Provider | Monthly Premium | Annual Cost | Key Features |\n"
-    result += "|----------|-----------------|-------------|-------------|\n"
+    parts = [
+        f"## {policy_type.title()} Insurance Comparison\n"
+        f"**Coverage Amount:** £{coverage_amount:,.0f}\n\n"
+        # Build comparison table
+        "| Provider | Monthly Premium | Annual Cost | Key Features |\n"
+        "|----------|-----------------|-------------|-------------|\n"
+    ]
     
     # Add our offering first if premium provided
     if our_premium:
         annual = our_premium * 12
-        result += f"| **Aviva (You)** | **£{our_premium:.2f}** | **£{annual:,.2f}** | Your current policy |\n"
+        parts.append(f"| **Aviva (You)** | **£{our_premium:.2f}** | **£{annual:,.2f}** | Your current policy |\n")
     
-    for item in data:
-        annual = item["premium"] * 12
-        features = ", ".join(item["features"][:2]) if item["features"] else "Standard coverage"
-        result += f"| {item['provider']} | £{item['premium']:.2f} | £{annual:,.2f} | {features} |\n"
+    parts += [
+        f"| {item['provider']} | £{item['premium']:.2f} | £{item['premium'] * 12:,.2f} | "
+        f"{', '.join(item['features'][:2]) if item['features'] else 'Standard coverage'} |\n"
+        for item in data
+    ]
     
     # Add summary
-    if data:
-        lowest = data[0]
-        highest = data[-1]
-        
-        result += f"\n**Market Summary:**\n"
-        result += f"- Lowest premium: {lowest['provider']} at £{lowest['premium']:.2f}/month\n"
-        result += f"- Highest premium: {highest['provider']} at £{highest['premium']:.2f}/month\n"
+    if premiums:
+        parts.append(
+            f"\n**Market Summary:**\n"
+            f"- Lowest premium: {lowest['provider']} at £{lowest['premium']:.2f}/month\n"
+            f"- Highest premium: {highest['provider']} at £{highest['premium']:.2f}/month\n"
+        )
         
         if our_premium:
-            avg_premium = sum(d["premium"] for d in data) / len(data)
             if our_premium < avg_premium:
                 savings = ((avg_premium - our_premium) / avg_premium) * 100
-                result += f"- Your rate is **{savings:.1f}% below** the market average!\n"
+                parts.append(f"- Your rate is **{savings:.1f}% below** the market average!\n")
             else:
-                result += f"- Market average: £{avg_premium:.2f}/month\n"
+                parts.append(f"- Market average: £{avg_premium:.2f}/month\n")
     
-    return result
+    return "".join(parts)
 
 
 def compare_customer_policy(policy_id: str) -> str:
@@ -184,31 +208,25 @@ def get_best_quote(policy_type: str, coverage_amount: float) -> dict:
     Returns:
         Dictionary with provider and premium info
     """
-    competitors = get_competitors()
-    best_quote = None
-    
-    for competitor in competitors:
-        for policy in competitor["policies"]:
-            if policy["policy_type"] == policy_type:
-                base_coverage = policy["coverage_amount"]
-                base_premium = policy["monthly_premium"]
-                scaled_premium = round(base_premium * (coverage_amount / base_coverage), 2)
-                
-                if best_quote is None or scaled_premium < best_quote["premium"]:
-                    best_quote = {
-                        "provider": competitor["provider"],
-                        "premium": scaled_premium,
-                        "features": policy.get("features", [])
-                    }
+    # Copied so callers can't modify the cached result
+    return dict(_cached_best_quote(policy_type, coverage_amount, file_version("competitors.json")))
+
+
+@lru_cache(maxsize=256)
+def _cached_best_quote(policy_type: str, coverage_amount: float, version) -> dict:
+    quotes, premiums = _scaled_premiums(policy_type, coverage_amount)
     
     # Add our competitive rate (10% better than best competitor)
-    if best_quote:
-        our_premium = round(best_quote["premium"] * 0.90, 2)
+    if premiums:
+        # First lowest premium wins ties, as an argmin would
+        best = min(range(len(premiums)), key=premiums.__getitem__)
+        competitor_premium = premiums[best]
+        our_premium = round(competitor_premium * 0.90, 2)
         return {
             "our_premium": our_premium,
-            "best_competitor": best_quote["provider"],
-            "competitor_premium": best_quote["premium"],
-            "savings": round(best_quote["premium"] - our_premium, 2)
+            "best_competitor": quotes[best][0],
+            "competitor_premium": competitor_premium,
+            "savings": round(competitor_premium - our_premium, 2)
         }
     
     return {}
@@ -5,21 +5,119 @@ Provides functions for loading, saving, and querying JSON data stores.
 All data operations are centralized here for maintainability.
 """
 
+import atexit
 import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Any
+from typing import Final, Optional, Any
 from datetime import datetime
 
+try:
+    # Rust JSON parser bundled with pydantic (a google-adk dependency); parses bytes directly
+    from pydantic_core import from_json as _parse_json
+except ImportError:
+    _parse_json = json.loads
+
+logger = logging.getLogger(__name__)
+
 # Get the data directory path relative to this file
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Bumped on every save_json; callers caching reads include it in their cache key
+_generation = 0
+
+# filename -> (_stamp(), parsed rows, {index key: index}); shared by all readers,
+# so treat as read-only. Indexes are built on first use and dropped with the rows.
+_CACHE: dict[str, tuple[Any, list[dict], dict]] = {}
+
+# Data files whose single-row updates are appended to a JSON-lines patch log
+# (see patch_row) instead of rewriting the whole file
+_PATCH_LOGS: Final[dict[str, str]] = {
+    "policies.json": "policies.patch.jsonl",
+    "life_events.json": "life_events.patch.jsonl",
+}
+# A patch log bigger than this is folded back into its base file
+_PATCH_LOG_LIMIT = 512 * 1024
+_patch_bytes: dict[str, int] = {}
+
+
+# Per-thread set of filenames saved inside batch_writes() but not yet written
+_batch = threading.local()
+
+# (now, now.isoformat()) shared by everything inside one operation_clock() block
+_clock: ContextVar[Optional[tuple[datetime, str]]] = ContextVar("operation_clock", default=None)
+
+# Files whose mtime was already checked in the current read_snapshot() block
+_checked: ContextVar[Optional[set[str]]] = ContextVar("read_snapshot", default=None)
+
+# (filename, serialized bytes, cached rows) for the background writer thread;
+# rows is None for a patch log line to append
+_writes: queue.Queue = queue.Queue()
+_writer: Optional[threading.Thread] = None
+
+# filename -> saves not yet on disk; while non-zero the cached rows are newer than the file
+_pending: dict[str, int] = {}
+_pending_lock = threading.Lock()
+# Files with a failed write since their last successful full save, and the
+# errors not yet reported by flush(); both guarded by _pending_lock
+_failed: set[str] = set()
+_write_errors: list[OSError] = []
+
+
+# Files larger than this are streamed for a single cold-cache lookup (see _lookup)
+_STREAM_THRESHOLD = 1 << 20
+_streamed: set[str] = set()
+_DECODER = json.JSONDecoder()
+# Whitespace and commas between the rows of a top-level JSON array
+_SKIP_SEPARATORS = re.compile(r"[\s,]*").match
+
+# Enum-like fields repeated across rows; interned once per file load so every row
+# shares one string object and equality checks short-circuit on identity
+_INTERNED_FIELDS = (
+    "policy_type", "status", "customer_type", "offer_type",
+    "transaction_type", "event_type", "provider"
+)
 
-def load_json(filename: str) -> list[dict]:
+_NON_DIGITS = re.compile(r"\D+")
+
+_POLICY_ID_RE = re.compile(r"^POL\d{3,6}$")
+
+# policy_type -> file holding its type-specific details records
+DETAIL_FILES: Final[dict[str, str]] = {
+    "life": "life_policies.json",
+    "property": "property_policies.json",
+    "vehicle": "vehicle_policies.json"
+}
+
+
+def data_generation() -> int:
+    """
+    Return a counter that changes whenever any data file is written.
+    
+    Returns:
+        The current write generation
+    """
+    return _generation
+
+
+def load_json(filename: str, mutable: bool = False) -> list[dict]:
     """
     Load JSON data from a file in the data directory.
+    Parsed files are cached until the file's mtime changes.
     
     Args:
         filename: Name of the JSON file (e.g., 'customers.json')
+        mutable: Return a copy (list and rows) that the caller may modify
+            before passing it to save_json
         
     Returns:
         List of dictionaries containing the data
@@ -27,22 +125,525 @@ def load_json(filename: str) -> list[dict]:
     Raises:
         FileNotFoundError: If the file doesn't exist
     """
-    filepath = DATA_DIR / filename
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    data = _entry(filename)[1]
+    if mutable:
+        return [dict(row) for row in data]
+    return data
+
+
+def file_version(filename: str) -> Any:
+    """
+    Opaque version of a data file's cached contents, for use in cache keys.
+    Changes whenever the file is reloaded (its mtime changed).
+    
+    Args:
+        filename: Name of the JSON file (e.g., 'competitors.json')
+        
+    Returns:
+        A hashable value that compares equal while the cached rows are unchanged
+    """
+    return _entry(filename)[0]
+
+
+def data_version(*filenames: str) -> tuple:
+    """
+    Cache key for results derived from data files: changes on any save made in
+    this process (see data_generation) and when one of the files is edited
+    outside it (see file_version).
+    
+    Args:
+        filenames: The data files the cached result reads
+        
+    Returns:
+        A hashable value that compares equal while none of that data changed
+    """
+    return (_generation, *map(file_version, filenames))
+
+
+def _entry(filename: str) -> tuple[Any, list[dict], dict]:
+    """
+    Cache entry for a data file, re-read only when its mtime has changed.
+    While a save is still queued for the file, the cached rows are returned as is;
+    inside read_snapshot() each file's mtime is checked once.
+    """
+    entry = _CACHE.get(filename)
+    checked = _checked.get()
+    if entry is not None and (_pending.get(filename) or (checked is not None and filename in checked)):
+        return entry
+    if checked is not None:
+        checked.add(filename)
+    stamp = _stamp(filename)
+    if entry is None or entry[0] != stamp:
+        rows = _parse_json((DATA_DIR / filename).read_bytes())
+        if filename in _PATCH_LOGS:
+            _apply_patch_log(filename, rows)
+        entry = (stamp, _intern_fields(rows), {})
+        _CACHE[filename] = entry
+    return entry
+
+
+def _stamp(filename: str) -> Any:
+    """st_mtime_ns of a data file, paired with its patch log's for files that have one."""
+    mtime = (DATA_DIR / filename).stat().st_mtime_ns
+    log = _PATCH_LOGS.get(filename)
+    if log is None:
+        return mtime
+    try:
+        return mtime, (DATA_DIR / log).stat().st_mtime_ns
+    except FileNotFoundError:
+        return mtime, 0
+
+
+def _aside_log(filename: str) -> Path:
+    """Where a file's patch log is moved while a full save replaces the file."""
+    return DATA_DIR / f"{_PATCH_LOGS[filename]}.compacting"
+
+
+def _set_aside_patch_log(filename: str) -> None:
+    """
+    Move a file's patch log aside before the file is replaced, so a crash between
+    the replace and the log's removal can be told apart on the next load (see
+    _apply_patch_log). Patches left aside by an earlier interrupted save are kept.
+    """
+    log = DATA_DIR / _PATCH_LOGS[filename]
+    aside = _aside_log(filename)
+    if not aside.exists():
+        try:
+            os.replace(log, aside)
+        except FileNotFoundError:
+            pass
+        return
+    try:
+        data = log.read_bytes()
+    except FileNotFoundError:
+        return
+    # Start on a fresh line in case the aside log ends with a torn write
+    _append_file(aside, b"\n" + data)
+    log.unlink()
+
+
+def _apply_patch_log(filename: str, rows: list[dict]) -> None:
+    """Replay a file's patch log onto freshly parsed rows, in place."""
+    logs = []
+    aside = _aside_log(filename)
+    try:
+        if aside.stat().st_mtime_ns < (DATA_DIR / filename).stat().st_mtime_ns:
+            # The file was replaced after these patches were set aside: it already
+            # includes them, and replaying could revert newer values
+            aside.unlink(missing_ok=True)
+        else:
+            # Interrupted before the file was replaced: the patches still apply
+            logs.append(aside.read_bytes())
+    except FileNotFoundError:
+        pass
+    try:
+        logs.append((DATA_DIR / _PATCH_LOGS[filename]).read_bytes())
+    except FileNotFoundError:
+        pass
+    _patch_bytes[filename] = sum(map(len, logs))
+    if not logs:
+        return
+    by_id = {row["id"]: row for row in rows}
+    for line in b"\n".join(logs).splitlines():
+        try:
+            patch = json.loads(line)
+        except ValueError:
+            # Torn final line from a crash mid-append
+            continue
+        row = by_id.get(patch["id"])
+        if row is not None:
+            row.update(patch["updates"])
+
+
+def _intern_fields(rows: list[dict]) -> list[dict]:
+    """Intern low-cardinality string fields in place (recursing into competitors' policies)."""
+    for row in rows:
+        for field in _INTERNED_FIELDS:
+            value = row.get(field)
+            if type(value) is str:
+                row[field] = sys.intern(value)
+        nested = row.get("policies")
+        if type(nested) is list:
+            _intern_fields(nested)
+    return rows
+
+
+def load_json_find(filename: str, key: str, value: Any) -> Optional[dict]:
+    """
+    Find the first row whose `key` equals `value` without loading the whole file.
+    Rows of the top-level array are decoded one at a time, stopping at the match.
+    
+    Args:
+        filename: Name of the JSON file (e.g., 'customers.json')
+        key: Field to match
+        value: Value to look for
+        
+    Returns:
+        The matching row, or None
+    """
+    text = (DATA_DIR / filename).read_text(encoding='utf-8')
+    pos = _SKIP_SEPARATORS(text, 0).end()
+    if text[pos:pos + 1] != "[":
+        return None
+    pos += 1
+    while True:
+        pos = _SKIP_SEPARATORS(text, pos).end()
+        if pos >= len(text) or text[pos] == "]":
+            return None
+        row, pos = _DECODER.raw_decode(text, pos)
+        if row.get(key) == value:
+            return row
+
+
+def _lookup(filename: str, key: str, value: Any) -> Optional[dict]:
+    """
+    Index lookup. On a cold cache the first lookup in a large file streams it with
+    load_json_find instead of parsing every row; later lookups load and index it.
+    """
+    if filename not in _CACHE and filename not in _streamed:
+        filepath = DATA_DIR / filename
+        log = _PATCH_LOGS.get(filename)
+        # Streaming reads the base file only, so not while patches are waiting to be folded in
+        if filepath.stat().st_size > _STREAM_THRESHOLD and not (
+                log and ((DATA_DIR / log).exists() or _aside_log(filename).exists())):
+            _streamed.add(filename)
+            return load_json_find(filename, key, value)
+    return _get_index(filename, key).get(value)
+
+
+def _get_index(filename: str, key: str) -> dict:
+    """
+    {row[key]: row} for a data file ('email' is lower-cased, 'phone' is passed
+    through normalize_phone). The first row wins on duplicates, as with a linear scan.
+    """
+    _, data, indexes = _entry(filename)
+    index = indexes.get(key)
+    if index is None:
+        index = {}
+        if key == "email":
+            for row in data:
+                index.setdefault(row["email"].lower(), row)
+        elif key == "phone":
+            for row in data:
+                phone = normalize_phone(row.get("phone"))
+                if phone:
+                    index.setdefault(phone, row)
+        else:
+            for row in data:
+                index.setdefault(row[key], row)
+        indexes[key] = index
+    return index
+
+
+def _get_positions(filename: str) -> dict:
+    """{row["id"]: position in the row list} for a data file; the first row wins on duplicates."""
+    _, data, indexes = _entry(filename)
+    index = indexes.get("id@")
+    if index is None:
+        index = {}
+        for i, row in enumerate(data):
+            index.setdefault(row["id"], i)
+        indexes["id@"] = index
+    return index
+
+
+def _get_multi_index(filename: str, key: str) -> dict:
+    """{row[key]: [rows]} for a data file, in file order."""
+    _, data, indexes = _entry(filename)
+    index = indexes.get(key + "[]")
+    if index is None:
+        index = defaultdict(list)
+        for row in data:
+            index[row[key]].append(row)
+        index = dict(index)
+        indexes[key + "[]"] = index
+    return index
+
+
+def next_id(filename: str, prefix: str) -> str:
+    """
+    Reserve the next sequential record ID for a data file.
+    The highest existing ID is scanned once per cache entry, then counted up.
+    
+    Args:
+        filename: Name of the JSON file (e.g., 'customers.json')
+        prefix: ID prefix used by that file (e.g., 'CUST')
+        
+    Returns:
+        The new ID (e.g., 'CUST042')
+    """
+    _, data, indexes = _entry(filename)
+    key = "#" + prefix
+    last = indexes.get(key)
+    if last is None:
+        last = max((int(row["id"].replace(prefix, "")) for row in data), default=0)
+    indexes[key] = last + 1
+    return f"{prefix}{last + 1:03d}"
 
 
 def save_json(filename: str, data: list[dict]) -> None:
     """
     Save data to a JSON file in the data directory.
+    The cache is updated immediately; the file is written by a background thread
+    (see flush).
     
     Args:
         filename: Name of the JSON file
         data: List of dictionaries to save
     """
-    filepath = DATA_DIR / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, default=str)
+    global _generation
+    # Copied so the caller's list stays theirs
+    rows = list(data)
+    _cache_rows(filename, rows)
+    dirty = getattr(_batch, "dirty", None)
+    with _pending_lock:
+        if dirty is None or filename not in dirty:
+            _pending[filename] = _pending.get(filename, 0) + 1
+    if dirty is not None:
+        # Inside batch_writes(): written once when the block exits
+        dirty.add(filename)
+    else:
+        _queue_write(filename, rows)
+    _generation += 1
+
+
+def _cache_rows(filename: str, rows: list[dict]) -> None:
+    """
+    Cache rows that are about to be written rather than re-reading them. The stamp
+    is refreshed once they are on disk; ID counters (next_id) carry over, lookup
+    indexes are rebuilt on demand.
+    """
+    old = _CACHE.get(filename)
+    counters = {k: v for k, v in old[2].items() if k[0] == "#"} if old else {}
+    _CACHE[filename] = (old[0] if old else 0, rows, counters)
+
+
+def patch_row(filename: str, row_id: str, updates: dict) -> Optional[dict]:
+    """
+    Update fields of one row. For files with a patch log the change is appended
+    to the log instead of rewriting the file; the log is folded back into the
+    file once it grows past _PATCH_LOG_LIMIT. Other files are saved in full.
+    
+    Args:
+        filename: Name of the JSON file (e.g., 'policies.json')
+        row_id: The row's 'id'
+        updates: Fields to set
+        
+    Returns:
+        The updated row, or None if no row has that ID
+    """
+    global _generation
+    i = _get_positions(filename).get(row_id)
+    if i is None:
+        return None
+    rows = list(_entry(filename)[1])
+    rows[i] = updated = {**rows[i], **updates}
+    
+    dirty = getattr(_batch, "dirty", None)
+    if filename not in _PATCH_LOGS or (dirty is not None and filename in dirty):
+        # Already being rewritten in full (or no log): a plain save covers it
+        save_json(filename, rows)
+        return updated
+    
+    _cache_rows(filename, rows)
+    line = json.dumps({"ts": now_iso(), "id": row_id, "updates": updates}, default=str)
+    payload = line.encode("utf-8") + b"\n"
+    with _pending_lock:
+        _pending[filename] = _pending.get(filename, 0) + 1
+    _start_writer()
+    _writes.put((filename, payload, None))
+    _generation += 1
+    
+    _patch_bytes[filename] = _patch_bytes.get(filename, 0) + len(payload)
+    if _patch_bytes[filename] > _PATCH_LOG_LIMIT:
+        # Compaction: a full save replaces the file and removes the log
+        _patch_bytes[filename] = 0
+        save_json(filename, rows)
+    return updated
+
+
+def _queue_write(filename: str, rows: list[dict]) -> None:
+    """Serialize rows now and hand them to the background writer."""
+    payload = json.dumps(rows, indent=2, default=str).encode("utf-8")
+    _start_writer()
+    _writes.put((filename, payload, rows))
+
+
+def _start_writer() -> None:
+    """Start the background writer thread on first use."""
+    global _writer
+    if _writer is None:
+        with _pending_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="save_json-writer", daemon=True)
+                _writer.start()
+                atexit.register(flush)
+
+
+def _write_loop() -> None:
+    """
+    Background writer. Saves queued back to back for the same file are coalesced,
+    so a burst of mutations costs one durable replace of the latest contents.
+    """
+    while True:
+        batch = [_writes.get()]
+        while True:
+            try:
+                batch.append(_writes.get_nowait())
+            except queue.Empty:
+                break
+        # A full save of a file supersedes earlier saves and patch appends for it
+        last_save = {filename: i for i, (filename, _, rows) in enumerate(batch) if rows is not None}
+        for i, (filename, payload, rows) in enumerate(batch):
+            if i < last_save.get(filename, -1):
+                continue
+            try:
+                if rows is None:
+                    _append_file(DATA_DIR / _PATCH_LOGS[filename], payload)
+                else:
+                    if filename in _PATCH_LOGS:
+                        _set_aside_patch_log(filename)
+                    _replace_file(DATA_DIR / filename, payload)
+                    if filename in _PATCH_LOGS:
+                        # The saved rows already include every logged patch
+                        _aside_log(filename).unlink(missing_ok=True)
+                    # The file now holds every change cached before this save
+                    with _pending_lock:
+                        _failed.discard(filename)
+            except OSError as e:
+                logger.exception("Failed to write %s", DATA_DIR / filename)
+                with _pending_lock:
+                    _failed.add(filename)
+                    _write_errors.append(e)
+        with _pending_lock:
+            for filename, _, _ in batch:
+                left = _pending[filename] - 1
+                if left:
+                    _pending[filename] = left
+                    continue
+                del _pending[filename]
+                if filename in _failed:
+                    # Some changes never reached the disk: drop them so reads reflect the file
+                    _failed.discard(filename)
+                    _CACHE.pop(filename, None)
+                    continue
+                # Nothing else queued: reads go back to mtime checks against what was
+                # written (the cache is always updated before a write is queued)
+                entry = _CACHE.get(filename)
+                if entry is not None and (DATA_DIR / filename).exists():
+                    _CACHE[filename] = (_stamp(filename), entry[1], entry[2])
+        for _ in batch:
+            _writes.task_done()
+
+
+def _replace_file(filepath: Path, payload: bytes) -> None:
+    """Atomically replace a file: write and fsync a temp file, then rename over the target."""
+    tmp = filepath.with_name(f"{filepath.name}.tmp.{os.getpid()}")
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable (POSIX only)
+        dir_fd = os.open(filepath.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _append_file(filepath: Path, payload: bytes) -> None:
+    """Durably append to a file."""
+    with open(filepath, 'ab') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def flush() -> None:
+    """
+    Block until every queued save_json write is on disk. Runs at exit.
+    
+    Raises:
+        OSError: A queued write failed since the last flush (the first such
+            error; all of them are logged). The cached rows of that file are
+            dropped, so reads show what is on disk.
+    """
+    _writes.join()
+    with _pending_lock:
+        errors = _write_errors[:]
+        _write_errors.clear()
+    if errors:
+        raise errors[0]
+
+
+@contextmanager
+def batch_writes():
+    """
+    Defer save_json calls made on this thread until the block exits, then write
+    each saved file once with its final contents. Reads inside the block see the
+    saved data immediately. Nested blocks are flushed by the outermost one.
+    Also usable as a decorator: @batch_writes()
+    """
+    if getattr(_batch, "dirty", None) is not None:
+        yield
+        return
+    _batch.dirty = dirty = set()
+    try:
+        yield
+    finally:
+        _batch.dirty = None
+        for filename in dirty:
+            _queue_write(filename, _CACHE[filename][1])
+
+
+@contextmanager
+def read_snapshot():
+    """
+    Check each data file's mtime at most once for the rest of the block, so a
+    tool that makes many customer/policy lookups does one stat per file instead
+    of one per lookup. Saves made inside the block are still seen.
+    Also usable as a decorator: @read_snapshot()
+    """
+    if _checked.get() is not None:
+        yield
+        return
+    token = _checked.set(set())
+    try:
+        yield
+    finally:
+        _checked.reset(token)
+
+
+@contextmanager
+def operation_clock():
+    """
+    Read the clock once for a logical operation: now() and now_iso() inside the
+    block return the same instant. Nested blocks keep the outer instant.
+    Also usable as a decorator: @operation_clock()
+    """
+    if _clock.get() is not None:
+        yield
+        return
+    current = datetime.now()
+    token = _clock.set((current, current.isoformat()))
+    try:
+        yield
+    finally:
+        _clock.reset(token)
+
+
+def now() -> datetime:
+    """The operation_clock() instant, or the current time outside one."""
+    frozen = _clock.get()
+    return frozen[0] if frozen is not None else datetime.now()
+
+
+def now_iso() -> str:
+    """now() as an ISO 8601 string, formatted once per operation_clock() block."""
+    frozen = _clock.get()
+    return frozen[1] if frozen is not None else datetime.now().isoformat()
 
 
 def get_customer_by_id(customer_id: str) -> Optional[dict]:
@@ -55,11 +656,7 @@ def get_customer_by_id(customer_id: str) -> Optional[dict]:
     Returns:
         Customer dictionary if found, None otherwise
     """
-    customers = load_json("customers.json")
-    for customer in customers:
-        if customer["id"] == customer_id:
-            return customer
-    return None
+    return _lookup("customers.json", "id", customer_id)
 
 
 def get_customer_by_email(email: str) -> Optional[dict]:
@@ -72,11 +669,26 @@ def get_customer_by_email(email: str) -> Optional[dict]:
     Returns:
         Customer dictionary if found, None otherwise
     """
-    customers = load_json("customers.json")
-    for customer in customers:
-        if customer["email"].lower() == email.lower():
-            return customer
-    return None
+    return _get_index("customers.json", "email").get(email.lower())
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Reduce a UK phone number to its national digits, so '+44 7700 900501',
+    '0044 7700 900501' and '07700900501' compare equal.
+    
+    Args:
+        phone: Phone number as entered (may be None)
+        
+    Returns:
+        Digits only, with a +44 / 0044 country code replaced by a leading 0
+    """
+    digits = _NON_DIGITS.sub("", phone or "")
+    if digits.startswith("0044"):
+        return "0" + digits[4:]
+    if digits.startswith("44") and len(digits) == 12:
+        return "0" + digits[2:]
+    return digits
 
 
 def get_customer_by_phone(phone: str) -> Optional[dict]:
@@ -89,11 +701,17 @@ def get_customer_by_phone(phone: str) -> Optional[dict]:
     Returns:
         Customer dictionary if found, None otherwise
     """
-    customers = load_json("customers.json")
-    for customer in customers:
-        if customer["phone"] == phone:
-            return customer
-    return None
+    return _get_index("customers.json", "phone").get(normalize_phone(phone))
+
+
+def customers_by_email_and_phone() -> tuple[dict, dict]:
+    """
+    Index customers by email and by phone from a single read of customers.json.
+    
+    Returns:
+        Tuple of ({lower-cased email: customer}, {normalize_phone(phone): customer})
+    """
+    return _get_index("customers.json", "email"), _get_index("customers.json", "phone")
 
 
 def get_policies_by_customer(customer_id: str) -> list[dict]:
@@ -106,8 +724,53 @@ def get_policies_by_customer(customer_id: str) -> list[dict]:
     Returns:
         List of policy dictionaries
     """
-    policies = load_json("policies.json")
-    return [p for p in policies if p["customer_id"] == customer_id]
+    return list(_get_multi_index("policies.json", "customer_id").get(customer_id, ()))
+
+
+@dataclass(slots=True, frozen=True)
+class PolicySummary:
+    """A customer's active policies, reduced to what offers and gap analysis need."""
+    active_count: int
+    total_premium: float
+    existing_types: frozenset[str]
+
+
+def active_policy_summary(customer_id: str) -> PolicySummary:
+    """
+    Summarize a customer's active policies in one pass.
+    Memoized per customer on the policies.json cache entry.
+    
+    Args:
+        customer_id: The customer's unique identifier
+        
+    Returns:
+        PolicySummary (active policy count, total monthly premium, policy types held)
+    """
+    _, _, indexes = _entry("policies.json")
+    summaries = indexes.setdefault("active_summary", {})
+    summary = summaries.get(customer_id)
+    if summary is None:
+        count, total, types = 0, 0, set()
+        for policy in get_policies_by_customer(customer_id):
+            if policy["status"] == "active":
+                count += 1
+                total += policy["monthly_premium"]
+                types.add(policy["policy_type"])
+        summary = summaries[customer_id] = PolicySummary(count, total, frozenset(types))
+    return summary
+
+
+def canonical_policy_id(policy_id: str) -> str:
+    """
+    Normalize a policy ID as typed by a customer (e.g. ' pol002 ' -> 'POL002').
+    
+    Args:
+        policy_id: The raw policy ID
+        
+    Returns:
+        The stripped, upper-cased and interned policy ID
+    """
+    return sys.intern(policy_id.strip().upper())
 
 
 def get_policy_by_id(policy_id: str) -> Optional[dict]:
@@ -120,11 +783,30 @@ def get_policy_by_id(policy_id: str) -> Optional[dict]:
     Returns:
         Policy dictionary if found, None otherwise
     """
-    policies = load_json("policies.json")
-    for policy in policies:
-        if policy["id"] == policy_id:
-            return policy
-    return None
+    policy_id = canonical_policy_id(policy_id)
+    if not _POLICY_ID_RE.match(policy_id):
+        return None
+    return _lookup("policies.json", "id", policy_id)
+
+
+def get_policy_with_details(policy_id: str) -> Optional[tuple[dict, Optional[dict]]]:
+    """
+    Retrieve a policy together with its type-specific details in one lookup.
+    
+    Args:
+        policy_id: The policy's unique identifier (e.g., 'POL001')
+        
+    Returns:
+        (policy, details) if the policy exists, None otherwise; details is None
+        when the policy type has no details record
+    """
+    policy = get_policy_by_id(policy_id)
+    if not policy:
+        return None
+    filename = DETAIL_FILES.get(policy["policy_type"])
+    if filename is None:
+        return policy, None
+    return policy, _get_index(filename, "policy_id").get(policy["id"])
 
 
 def get_policy_details(policy_id: str, policy_type: str) -> Optional[dict]:
@@ -138,20 +820,10 @@ def get_policy_details(policy_id: str, policy_type: str) -> Optional[dict]:
     Returns:
         Policy details dictionary if found, None otherwise
     """
-    type_to_file = {
-        "life": "life_policies.json",
-        "property": "property_policies.json",
-        "vehicle": "vehicle_policies.json"
-    }
-    
-    if policy_type not in type_to_file:
+    filename = DETAIL_FILES.get(policy_type)
+    if filename is None:
         return None
-        
-    details = load_json(type_to_file[policy_type])
-    for detail in details:
-        if detail["policy_id"] == policy_id:
-            return detail
-    return None
+    return _get_index(filename, "policy_id").get(policy_id)
 
 
 def get_life_events_by_customer(customer_id: str, processed: Optional[bool] = None) -> list[dict]:
@@ -165,13 +837,12 @@ def get_life_events_by_customer(customer_id: str, processed: Optional[bool] = No
     Returns:
         List of life event dictionaries
     """
-    events = load_json("life_events.json")
-    filtered = [e for e in events if e["customer_id"] == customer_id]
+    events = _get_multi_index("life_events.json", "customer_id").get(customer_id, ())
     
     if processed is not None:
-        filtered = [e for e in filtered if e["processed"] == processed]
+        return [e for e in events if e["processed"] == processed]
     
-    return filtered
+    return list(events)
 
 
 def get_offers(offer_type: Optional[str] = None, active_only: bool = True) -> list[dict]:
@@ -196,6 +867,20 @@ def get_offers(offer_type: Optional[str] = None, active_only: bool = True) -> li
     return offers
 
 
+def get_offer_by_id(offer_id: str) -> Optional[dict]:
+    """
+    Retrieve an active offer by its unique ID.
+    
+    Args:
+        offer_id: The offer's unique identifier
+        
+    Returns:
+        Offer dictionary if found and active, None otherwise
+    """
+    offer = _get_index("offers.json", "id").get(offer_id)
+    return offer if offer is not None and offer["active"] else None
+
+
 def get_competitors() -> list[dict]:
     """
     Get competitor policy data for comparison.
@@ -206,6 +891,35 @@ def get_competitors() -> list[dict]:
     return load_json("competitors.json")
 
 
+def get_competitor_quotes_by_type(policy_type: str) -> tuple[tuple, ...]:
+    """
+    Get competitor base quotes for one policy type, flattened across providers.
+    
+    Args:
+        policy_type: Type of policy ('life', 'property', 'vehicle')
+        
+    Returns:
+        Tuple of (provider, base_coverage, base_premium, features) tuples, in file
+        order; built once per file load with float amounts and tuple features
+    """
+    _, competitors, indexes = _entry("competitors.json")
+    by_type = indexes.get("policy_type[]")
+    if by_type is None:
+        by_type = defaultdict(list)
+        for competitor in competitors:
+            provider = competitor["provider"]
+            for policy in competitor["policies"]:
+                by_type[policy["policy_type"]].append((
+                    provider,
+                    float(policy["coverage_amount"]),
+                    float(policy["monthly_premium"]),
+                    tuple(policy.get("features", ()))
+                ))
+        by_type = {policy_type: tuple(quotes) for policy_type, quotes in by_type.items()}
+        indexes["policy_type[]"] = by_type
+    return by_type.get(policy_type, ())
+
+
 def add_customer(customer_data: dict) -> dict:
     """
     Add a new customer to the database.
@@ -216,11 +930,10 @@ def add_customer(customer_data: dict) -> dict:
     Returns:
         The created customer record with assigned ID
     """
-    customers = load_json("customers.json")
+    customers = load_json("customers.json", mutable=True)
     
     # Generate new ID
-    max_id = max([int(c["id"].replace("CUST", "")) for c in customers], default=0)
-    new_id = f"CUST{max_id + 1:03d}"
+    new_id = next_id("customers.json", "CUST")
     
     # Create customer record
     new_customer = {
@@ -231,7 +944,7 @@ def add_customer(customer_data: dict) -> dict:
         "dob": customer_data.get("dob"),
         "ssn_last4": customer_data.get("ssn_last4", ""),
         "customer_type": "existing",  # Once registered, they're existing
-        "registration_date": datetime.now().isoformat(),
+        "registration_date": now_iso(),
         "address": customer_data.get("address", "")
     }
     
@@ -254,18 +967,17 @@ def add_transaction(policy_id: str, transaction_type: str, amount: float, descri
     Returns:
         The created transaction record
     """
-    transactions = load_json("transactions.json")
+    transactions = load_json("transactions.json", mutable=True)
     
     # Generate new ID
-    max_id = max([int(t["id"].replace("TXN", "")) for t in transactions], default=0)
-    new_id = f"TXN{max_id + 1:03d}"
+    new_id = next_id("transactions.json", "TXN")
     
     new_transaction = {
         "id": new_id,
         "policy_id": policy_id,
         "type": transaction_type,
         "amount": amount,
-        "transaction_date": datetime.now().isoformat(),
+        "transaction_date": now_iso(),
         "description": description
     }
     
@@ -0,0 +1,71 @@
+"""
+Tool Metrics Module
+===================
+Records per-call latency of agent tools in a bounded in-memory buffer,
+so slow tools can be found before optimizing them.
+"""
+
+import functools
+import inspect
+import time
+from collections import defaultdict, deque
+
+# Most recent latencies kept per tool
+_WINDOW = 512
+
+# tool name -> latencies in nanoseconds, oldest dropped first
+_METRICS: defaultdict[str, deque] = defaultdict(lambda: deque(maxlen=_WINDOW))
+
+
+def timed_tool(fn):
+    """
+    Wrap a tool function so each call's latency is recorded under its name.
+    The signature and docstring are preserved for ADK's FunctionTool.
+
+    Args:
+        fn: The tool function (sync or async)
+
+    Returns:
+        The wrapped function
+    """
+    samples = _METRICS[fn.__name__]
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter_ns() - t0)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter_ns() - t0)
+    return wrapper
+
+
+def tool_metrics() -> dict:
+    """
+    Summarize recorded tool latencies.
+
+    Returns:
+        Dictionary of tool name -> {calls, p50_ms, p95_ms, max_ms} over the recent window
+    """
+    summary = {}
+    for name, samples in list(_METRICS.items()):
+        ordered = sorted(samples)
+        if not ordered:
+            continue
+        n = len(ordered)
+        summary[name] = {
+            "calls": n,
+            "p50_ms": round(ordered[n // 2] / 1e6, 3),
+            "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] / 1e6, 3),
+            "max_ms": round(ordered[-1] / 1e6, 3),
+        }
+    return summary
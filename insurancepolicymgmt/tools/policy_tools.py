@@ -5,15 +5,21 @@ Provides CRUD operations for insurance policies.
 Handles creation, updates, renewals, cancellations, and coverage modifications.
 """
 
-from typing import Optional, Tuple
+from typing import Final, Optional, Tuple
 from datetime import datetime, timedelta
-from tools.data_tools import (
-    load_json, save_json,
+from .data_tools import (
+    DETAIL_FILES, load_json, save_json, patch_row, next_id, batch_writes,
+    operation_clock, now, now_iso,
     get_policy_by_id, get_policies_by_customer,
     add_transaction
 )
 
+# policy_type -> ID prefix of its details records (LP001, ...)
+_DETAIL_ID_PREFIXES: Final[dict[str, str]] = {"life": "LP", "property": "PP", "vehicle": "VP"}
 
+
+@batch_writes()
+@operation_clock()
 def create_policy(customer_id: str, policy_type: str, coverage_amount: float,
                   monthly_premium: float, term_years: int = 1,
                   details: Optional[dict] = None) -> Tuple[dict, str]:
@@ -31,14 +37,13 @@ def create_policy(customer_id: str, policy_type: str, coverage_amount: float,
     Returns:
         Tuple of (policy_record, confirmation_message)
     """
-    policies = load_json("policies.json")
+    policies = load_json("policies.json", mutable=True)
     
     # Generate new policy ID
-    max_id = max([int(p["id"].replace("POL", "")) for p in policies], default=0)
-    new_id = f"POL{max_id + 1:03d}"
+    new_id = next_id("policies.json", "POL")
     
-    now = datetime.now()
-    end_date = now + timedelta(days=365 * term_years)
+    start = now()
+    end_date = start + timedelta(days=365 * term_years)
     
     new_policy = {
         "id": new_id,
@@ -47,10 +52,10 @@ def create_policy(customer_id: str, policy_type: str, coverage_amount: float,
         "status": "active",
         "coverage_amount": coverage_amount,
         "monthly_premium": monthly_premium,
-        "start_date": now.strftime("%Y-%m-%d"),
+        "start_date": start.strftime("%Y-%m-%d"),
         "end_date": end_date.strftime("%Y-%m-%d"),
-        "created_at": now.isoformat(),
-        "updated_at": now.isoformat()
+        "created_at": now_iso(),
+        "updated_at": now_iso()
     }
     
     policies.append(new_policy)
@@ -78,22 +83,14 @@ def create_policy(customer_id: str, policy_type: str, coverage_amount: float,
 
 def _add_policy_details(policy_id: str, policy_type: str, details: dict) -> None:
     """Add type-specific policy details to the appropriate JSON file."""
-    type_to_file = {
-        "life": "life_policies.json",
-        "property": "property_policies.json",
-        "vehicle": "vehicle_policies.json"
-    }
-    
-    if policy_type not in type_to_file:
+    filename = DETAIL_FILES.get(policy_type)
+    if filename is None:
         return
     
-    filename = type_to_file[policy_type]
-    existing = load_json(filename)
+    existing = load_json(filename, mutable=True)
     
     # Generate new detail ID
-    prefix = {"life": "LP", "property": "PP", "vehicle": "VP"}[policy_type]
-    max_id = max([int(d["id"].replace(prefix, "")) for d in existing], default=0)
-    new_id = f"{prefix}{max_id + 1:03d}"
+    new_id = next_id(filename, _DETAIL_ID_PREFIXES[policy_type])
     
     details["id"] = new_id
     details["policy_id"] = policy_id
@@ -113,25 +110,26 @@ def update_policy(policy_id: str, updates: dict) -> Tuple[bool, str]:
     Returns:
         Tuple of (success: bool, message: str)
     """
-    policies = load_json("policies.json")
-    
-    for i, policy in enumerate(policies):
-        if policy["id"] == policy_id:
-            # Prevent updating certain fields
-            protected_fields = {"id", "customer_id", "created_at"}
-            for field in protected_fields:
-                updates.pop(field, None)
-            
-            # Apply updates
-            policies[i].update(updates)
-            policies[i]["updated_at"] = datetime.now().isoformat()
-            
-            save_json("policies.json", policies)
-            return True, f"Policy {policy_id} has been updated successfully."
-    
-    return False, f"Policy {policy_id} not found."
+    # Prevent updating certain fields
+    protected_fields = {"id", "customer_id", "created_at"}
+    for field in protected_fields:
+        updates.pop(field, None)
+    
+    policy = get_policy_by_id(policy_id)
+    if not policy:
+        return False, f"Policy {policy_id} not found."
+    
+    # Nothing would change: skip the write (and leave updated_at alone)
+    if all(field in policy and policy[field] == value for field, value in updates.items()):
+        return True, f"Policy {policy_id} is already up to date."
+    
+    # Apply updates; recorded in the policies patch log rather than rewriting the file
+    patch_row("policies.json", policy["id"], {**updates, "updated_at": now_iso()})
+    return True, f"Policy {policy_id} has been updated successfully."
 
 
+@batch_writes()
+@operation_clock()
 def renew_policy(policy_id: str, term_years: int = 1) -> Tuple[bool, str]:
     """
     Renew an existing policy for another term.
@@ -177,6 +175,8 @@ def renew_policy(policy_id: str, term_years: int = 1) -> Tuple[bool, str]:
     return False, "Failed to renew policy. Please contact support."
 
 
+@batch_writes()
+@operation_clock()
 def cancel_policy(policy_id: str, reason: str = "") -> Tuple[bool, str, float]:
     """
     Cancel an insurance policy.
@@ -198,7 +198,7 @@ def cancel_policy(policy_id: str, reason: str = "") -> Tuple[bool, str, float]:
     
     # Calculate prorated refund
     end_date = datetime.strptime(policy["end_date"], "%Y-%m-%d")
-    days_remaining = (end_date - datetime.now()).days
+    days_remaining = (end_date - now()).days
     
     if days_remaining > 0:
         annual_premium = policy["monthly_premium"] * 12
@@ -228,6 +228,8 @@ def cancel_policy(policy_id: str, reason: str = "") -> Tuple[bool, str, float]:
     return False, "Failed to cancel policy. Please contact support.", 0.0
 
 
+@batch_writes()
+@operation_clock()
 def modify_coverage(policy_id: str, new_coverage: float) -> Tuple[bool, str]:
     """
     Modify the coverage amount of an existing policy.
@@ -248,6 +250,8 @@ def modify_coverage(policy_id: str, new_coverage: float) -> Tuple[bool, str]:
         return False, "Can only modify coverage on active policies."
     
     old_coverage = policy["coverage_amount"]
+    if new_coverage == old_coverage:
+        return True, f"Your coverage is already £{new_coverage:,.0f}. No change was needed."
     
     # Calculate new premium (simplified: proportional to coverage)
     ratio = new_coverage / old_coverage
@@ -297,14 +301,16 @@ def list_customer_policies(customer_id: str, include_cancelled: bool = False) ->
     if not policies:
         return "You don't have any active policies."
     
-    result = "**Your Insurance Policies:**\n\n"
+    parts = ["**Your Insurance Policies:**\n\n"]
     
     for policy in policies:
         status_emoji = "✅" if policy["status"] == "active" else "❌"
-        result += f"{status_emoji} **{policy['policy_type'].title()} Insurance** (ID: {policy['id']})\n"
-        result += f"   Coverage: £{policy['coverage_amount']:,.0f}\n"
-        result += f"   Monthly Premium: £{policy['monthly_premium']:.2f}\n"
-        result += f"   Status: {policy['status'].title()}\n"
-        result += f"   Valid: {policy['start_date']} to {policy['end_date']}\n\n"
+        parts.append(
+            f"{status_emoji} **{policy['policy_type'].title()} Insurance** (ID: {policy['id']})\n"
+            f"   Coverage: £{policy['coverage_amount']:,.0f}\n"
+            f"   Monthly Premium: £{policy['monthly_premium']:.2f}\n"
+            f"   Status: {policy['status'].title()}\n"
+            f"   Valid: {policy['start_date']} to {policy['end_date']}\n\n"
+        )
     
-    return result.strip()
+    return "".join(parts).strip()
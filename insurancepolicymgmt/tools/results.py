@@ -0,0 +1,53 @@
+"""
+Tool Result Types
+=================
+Slotted result records passed around inside the tools; converted to a plain
+dict only when handed back to ADK.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True, frozen=True)
+class ComparisonResult:
+    comparison: str
+    policy_id: str
+    status: str = "success"
+
+    def to_dict(self) -> dict:
+        """Plain dict for the ADK function response (cheaper than dataclasses.asdict)."""
+        return {"comparison": self.comparison, "policy_id": self.policy_id, "status": self.status}
+
+
+@dataclass(slots=True, frozen=True)
+class QuoteResult:
+    policy_type: str
+    coverage_amount: str
+    monthly_premium: str
+    annual_premium: str
+    message: str
+    market_comparison: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Plain dict for the ADK function response; market_comparison only when known."""
+        result = {
+            "policy_type": self.policy_type,
+            "coverage_amount": self.coverage_amount,
+            "monthly_premium": self.monthly_premium,
+            "annual_premium": self.annual_premium,
+        }
+        if self.market_comparison is not None:
+            result["market_comparison"] = self.market_comparison
+        result["message"] = self.message
+        return result
+
+
+@dataclass(slots=True, frozen=True)
+class OfferResult:
+    success: bool
+    message: str
+
+    def to_dict(self) -> dict:
+        """Plain dict for the ADK function response."""
+        return {"success": self.success, "message": self.message}
@@ -5,101 +5,133 @@ Handles customer retention when they attempt to cancel policies.
 Provides offers, discounts, and incentives to retain customers.
 """
 
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Tuple, Optional
-from tools.data_tools import (
-    get_offers, get_customer_by_id, get_policies_by_customer,
-    load_json, save_json
+from .data_tools import (
+    get_offers, get_offer_by_id, get_customer_by_id, get_policy_by_id, active_policy_summary,
+    load_json, save_json, batch_writes, read_snapshot
 )
-from tools.policy_tools import update_policy
+from .policy_tools import update_policy
 
 
-def get_retention_offers(customer_id: str, policy_id: str) -> list[dict]:
+def customer_value_bracket(customer_id: str) -> Optional[str]:
     """
-    Get available retention offers for a customer attempting to cancel.
-    Offers are personalized based on customer tenure and policy value.
+    Classify a customer by the total monthly premium of their active policies.
+    Retention offers depend only on this bracket.
     
     Args:
         customer_id: ID of the customer
-        policy_id: ID of the policy they want to cancel
         
     Returns:
-        List of applicable retention offers
+        'high', 'medium' or 'standard', or None if the customer doesn't exist
     """
     customer = get_customer_by_id(customer_id)
     if not customer:
-        return []
-    
-    # Get all retention-type offers
-    retention_offers = get_offers(offer_type="retention")
-    
-    # Get customer's policies to check loyalty
-    all_policies = get_policies_by_customer(customer_id)
-    active_policies = [p for p in all_policies if p["status"] == "active"]
-    
-    # Calculate customer value
-    total_monthly_premium = sum(p["monthly_premium"] for p in active_policies)
-    
-    # Personalize offers based on customer value
-    personalized_offers = []
+        return None
+    
+    # Calculate customer value from their active policies
+    total_monthly_premium = active_policy_summary(customer_id).total_premium
+    if total_monthly_premium > 300:
+        return "high"
+    if total_monthly_premium > 150:
+        return "medium"
+    return "standard"
+
+
+# Highest retention discount (%) offered per customer value bracket: high-value
+# customers get the best offers, medium value excludes the highest discount,
+# standard customers get basic retention offers
+_MAX_DISCOUNT = {"high": float("inf"), "medium": 25, "standard": 20}
+
+
+def retention_offers_for_bracket(bracket: str) -> list[dict]:
+    """
+    Get the retention offers available to a customer value bracket.
     
-    for offer in retention_offers:
-        offer_copy = offer.copy()
+    Args:
+        bracket: Bracket from customer_value_bracket
         
-        # High-value customers get the best offers
-        if total_monthly_premium > 300:
-            # Give them all offers including the best ones
-            personalized_offers.append(offer_copy)
-        elif total_monthly_premium > 150:
-            # Medium value - exclude the highest discount
-            if offer["discount_percent"] <= 25:
-                personalized_offers.append(offer_copy)
-        else:
-            # Standard customers get basic retention offers
-            if offer["discount_percent"] <= 20:
-                personalized_offers.append(offer_copy)
-    
-    return personalized_offers
+    Returns:
+        List of applicable retention offers (shared cached rows; copy before modifying)
+    """
+    max_discount = _MAX_DISCOUNT.get(bracket, _MAX_DISCOUNT["standard"])
+    return [offer for offer in get_offers(offer_type="retention")
+            if offer["discount_percent"] <= max_discount]
 
 
-def present_retention_offers(customer_id: str, policy_id: str) -> str:
+@read_snapshot()
+def get_retention_offers(customer_id: str, policy_id: str) -> list[dict]:
     """
-    Present retention offers to a customer in a formatted way.
-    This should be called when a customer expresses intent to cancel.
+    Get available retention offers for a customer attempting to cancel.
+    Offers are personalized based on customer tenure and policy value.
     
     Args:
         customer_id: ID of the customer
         policy_id: ID of the policy they want to cancel
         
     Returns:
-        Formatted string presenting available offers
+        List of applicable retention offers
     """
-    offers = get_retention_offers(customer_id, policy_id)
+    bracket = customer_value_bracket(customer_id)
+    if bracket is None:
+        return []
+    return retention_offers_for_bracket(bracket)
+
+
+def format_retention_offers(offers: list[dict]) -> str:
+    """
+    Format retention offers for presentation to the customer.
     
+    Args:
+        offers: Offers from get_retention_offers
+        
+    Returns:
+        Formatted string presenting the offers
+    """
     if not offers:
         return "I understand you'd like to cancel. Let me process that for you."
     
-    result = """## Before You Go... 🤝
+    parts = ["""## Before You Go... 🤝
 
 We truly value you as a customer and would hate to see you leave. 
 Here are some exclusive offers we'd like to extend to you:
 
-"""
+"""]
     
     for i, offer in enumerate(offers, 1):
-        result += f"### Option {i}: {offer['name']}\n"
+        parts.append(f"### Option {i}: {offer['name']}\n")
         if offer["discount_percent"] > 0:
-            result += f"💰 **{offer['discount_percent']}% Discount** on your premium\n"
-        result += f"📋 {offer['description']}\n\n"
+            parts.append(f"💰 **{offer['discount_percent']}% Discount** on your premium\n")
+        parts.append(f"📋 {offer['description']}\n\n")
     
-    result += """---
+    parts.append("""---
 **Would you like to accept any of these offers instead of cancelling?**
 
 Just let me know which option interests you, or if you'd still like to proceed with the cancellation.
-"""
+""")
     
-    return result
+    return "".join(parts)
 
 
+@read_snapshot()
+def present_retention_offers(customer_id: str, policy_id: str) -> str:
+    """
+    Present retention offers to a customer in a formatted way.
+    This should be called when a customer expresses intent to cancel.
+    
+    Args:
+        customer_id: ID of the customer
+        policy_id: ID of the policy they want to cancel
+        
+    Returns:
+        Formatted string presenting available offers
+    """
+    return format_retention_offers(get_retention_offers(customer_id, policy_id))
+
+
+@batch_writes()
 def apply_retention_offer(customer_id: str, policy_id: str, offer_id: str) -> Tuple[bool, str]:
     """
     Apply a retention offer to a customer's policy.
@@ -113,46 +145,17 @@ def apply_retention_offer(customer_id: str, policy_id: str, offer_id: str) -> Tu
         Tuple of (success: bool, message: str)
     """
     # Verify offer exists and is valid
-    offers = get_offers()
-    offer = next((o for o in offers if o["id"] == offer_id), None)
+    offer = get_offer_by_id(offer_id)
     
     if not offer:
         return False, "Offer not found or has expired."
     
-    # Get the policy
-    from tools.data_tools import get_policy_by_id
     policy = get_policy_by_id(policy_id)
     
     if not policy:
         return False, "Policy not found."
     
-    # Calculate new premium with discount
-    if offer["discount_percent"] > 0:
-        discount_multiplier = 1 - (offer["discount_percent"] / 100)
-        new_premium = round(policy["monthly_premium"] * discount_multiplier, 2)
-        old_premium = policy["monthly_premium"]
-        
-        # Update the policy
-        success, _ = update_policy(policy_id, {"monthly_premium": new_premium})
-        
-        if success:
-            savings = old_premium - new_premium
-            annual_savings = savings * 12
-            
-            return True, f"""
-## Offer Applied Successfully! 🎉
-
-Thank you for choosing to stay with Aviva Insurance!
-
-**{offer['name']}** has been applied to your policy.
-
-- Previous Premium: £{old_premium:.2f}/month
-- New Premium: £{new_premium:.2f}/month
-- **You Save: £{savings:.2f}/month (£{annual_savings:.2f}/year)**
-
-We're committed to providing you with the best coverage at the best value.
-"""
-    else:
+    if offer["discount_percent"] <= 0:
         # Non-discount offers (like premium freeze)
         # These would require different handling in a real system
         return True, f"""
@@ -167,7 +170,28 @@ Thank you for choosing to stay with Aviva Insurance!
 We appreciate your loyalty and are committed to keeping you protected.
 """
     
-    return False, "Failed to apply offer. Please contact support."
+    # Calculate new premium with discount
+    old_premium = policy["monthly_premium"]
+    new_premium = round(old_premium * (1 - offer["discount_percent"] / 100), 2)
+    
+    success, _ = update_policy(policy_id, {"monthly_premium": new_premium})
+    if not success:
+        return False, "Failed to apply offer. Please contact support."
+    
+    savings = old_premium - new_premium
+    return True, f"""
+## Offer Applied Successfully! 🎉
+
+Thank you for choosing to stay with Aviva Insurance!
+
+**{offer['name']}** has been applied to your policy.
+
+- Previous Premium: £{old_premium:.2f}/month
+- New Premium: £{new_premium:.2f}/month
+- **You Save: £{savings:.2f}/month (£{savings * 12:.2f}/year)**
+
+We're committed to providing you with the best coverage at the best value.
+"""
 
 
 def get_cancellation_reasons() -> list[str]:
@@ -201,12 +225,12 @@ def process_cancellation_with_reason(policy_id: str, reason: str) -> str:
     Returns:
         Confirmation message
     """
-    from tools.policy_tools import cancel_policy
+    from .policy_tools import cancel_policy
     
     success, message, refund = cancel_policy(policy_id, reason)
     
     if success:
-        result = f"""
+        return f"""
 ## Cancellation Confirmed
 
 {message}
@@ -219,11 +243,23 @@ Our door is always open, and we often have special offers for returning customer
 
 Thank you for being an Aviva customer. We wish you all the best.
 """
-        return result
     
     return message
 
 
+# Loyalty tier by score: below 25 bronze, 25+ silver, 50+ gold, 75+ platinum
+_TIER_THRESHOLDS = (25, 50, 75)
+_TIER_NAMES = ("bronze", "silver", "gold", "platinum")
+
+
+@lru_cache(maxsize=1024)
+def _tenure_years(registration_date: str, today_ord: int) -> float:
+    """Years since registration_date (ISO timestamp) as of the given day's ordinal."""
+    registered = datetime.fromisoformat(registration_date).astimezone(timezone.utc)
+    return (today_ord - registered.toordinal()) / 365
+
+
+@read_snapshot()
 def calculate_loyalty_score(customer_id: str) -> dict:
     """
     Calculate a customer's loyalty score for internal use.
@@ -236,43 +272,31 @@ def calculate_loyalty_score(customer_id: str) -> dict:
     Returns:
         Dictionary with loyalty metrics
     """
-    from tools.data_tools import get_policies_by_customer
-    from datetime import datetime
-    
     customer = get_customer_by_id(customer_id)
     if not customer:
         return {"score": 0, "tier": "new"}
     
-    policies = get_policies_by_customer(customer_id)
-    active_policies = [p for p in policies if p["status"] == "active"]
+    # Active policy count and total monthly premium
+    summary = active_policy_summary(customer_id)
+    active_count, total_premium = summary.active_count, summary.total_premium
     
     # Calculate tenure in years
-    reg_date = datetime.fromisoformat(customer["registration_date"].replace("Z", "+00:00"))
-    tenure_years = (datetime.now(reg_date.tzinfo) - reg_date).days / 365
-    
-    # Calculate total monthly premium
-    total_premium = sum(p["monthly_premium"] for p in active_policies)
+    tenure_years = _tenure_years(customer["registration_date"],
+                                 datetime.now(timezone.utc).toordinal())
     
     # Score calculation
     score = 0
     score += min(tenure_years * 10, 50)  # Up to 50 points for tenure
     score += min(total_premium / 10, 30)  # Up to 30 points for premium
-    score += len(active_policies) * 5     # 5 points per active policy
+    score += active_count * 5             # 5 points per active policy
     
     # Determine tier
-    if score >= 75:
-        tier = "platinum"
-    elif score >= 50:
-        tier = "gold"
-    elif score >= 25:
-        tier = "silver"
-    else:
-        tier = "bronze"
+    tier = _TIER_NAMES[bisect_right(_TIER_THRESHOLDS, score)]
     
     return {
         "score": round(score, 1),
         "tier": tier,
         "tenure_years": round(tenure_years, 1),
-        "active_policies": len(active_policies),
+        "active_policies": active_count,
         "monthly_premium": total_premium
     }
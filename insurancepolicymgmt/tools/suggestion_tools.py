@@ -5,11 +5,12 @@ Provides intelligent policy recommendations based on customer situations,
 life events, and coverage gaps.
 """
 
+import re
 from typing import Optional
-from datetime import datetime, timedelta
-from tools.data_tools import (
-    get_customer_by_id, get_policies_by_customer,
-    get_life_events_by_customer, load_json, save_json
+from datetime import date
+from .data_tools import (
+    get_customer_by_id, active_policy_summary,
+    get_life_events_by_customer, patch_row, read_snapshot
 )
 
 
@@ -27,89 +28,123 @@ def analyze_life_events(customer_id: str) -> list[dict]:
     # Get unprocessed events
     events = get_life_events_by_customer(customer_id, processed=False)
     
-    # Filter for upcoming events (within 90 days)
-    today = datetime.now()
+    # Filter for upcoming events (within 90 days); only those in range are copied
+    today = date.today().toordinal()
     upcoming = []
     
     for event in events:
-        event_date = datetime.strptime(event["event_date"], "%Y-%m-%d")
-        days_until = (event_date - today).days
-        
+        days_until = date.fromisoformat(event["event_date"]).toordinal() - today
         if -30 <= days_until <= 90:  # Include recent past events too
-            event_copy = event.copy()
-            event_copy["days_until"] = days_until
-            event_copy["recommendations"] = _get_event_recommendations(event["event_type"])
-            upcoming.append(event_copy)
+            upcoming.append({
+                **event,
+                "days_until": days_until,
+                "recommendations": _EVENT_RECOMMENDATIONS.get(event["event_type"], ())
+            })
     
     return upcoming
 
 
-def _get_event_recommendations(event_type: str) -> list[dict]:
-    """Get policy recommendations for a specific life event type."""
-    recommendations = {
-        "marriage": [
-            {
-                "policy_type": "life",
-                "priority": "high",
-                "reason": "Protect your spouse with life insurance coverage",
-                "suggested_coverage": 500000
-            },
-            {
-                "policy_type": "property",
-                "priority": "medium",
-                "reason": "Consider updating or getting homeowner's insurance if moving to a new home",
-                "suggested_coverage": 350000
-            }
-        ],
-        "child_turning_18": [
-            {
-                "policy_type": "vehicle",
-                "priority": "high",
-                "reason": "Your child may need their own auto insurance as a new driver",
-                "suggested_coverage": 50000
-            },
-            {
-                "policy_type": "life",
-                "priority": "medium",
-                "reason": "Consider a starter life insurance policy for your child",
-                "suggested_coverage": 100000
-            }
-        ],
-        "house_purchase": [
-            {
-                "policy_type": "property",
-                "priority": "high",
-                "reason": "Protect your new home with comprehensive homeowner's insurance",
-                "suggested_coverage": 400000
-            }
-        ],
-        "new_baby": [
-            {
-                "policy_type": "life",
-                "priority": "high",
-                "reason": "Increase life insurance to protect your growing family",
-                "suggested_coverage": 750000
-            }
-        ],
-        "retirement": [
-            {
-                "policy_type": "life",
-                "priority": "medium",
-                "reason": "Review life insurance needs - you may need less coverage or different type",
-                "suggested_coverage": 250000
-            },
-            {
-                "policy_type": "property",
-                "priority": "low",
-                "reason": "Consider adjusting property coverage if downsizing",
-                "suggested_coverage": 300000
-            }
-        ]
+# Policy recommendations per life event type, built once at import; tuples so
+# the shared entries handed to callers can't be appended to
+_EVENT_RECOMMENDATIONS: dict[str, tuple[dict, ...]] = {
+    "marriage": (
+        {
+            "policy_type": "life",
+            "priority": "high",
+            "reason": "Protect your spouse with life insurance coverage",
+            "suggested_coverage": 500000
+        },
+        {
+            "policy_type": "property",
+            "priority": "medium",
+            "reason": "Consider updating or getting homeowner's insurance if moving to a new home",
+            "suggested_coverage": 350000
+        },
+    ),
+    "child_turning_18": (
+        {
+            "policy_type": "vehicle",
+            "priority": "high",
+            "reason": "Your child may need their own auto insurance as a new driver",
+            "suggested_coverage": 50000
+        },
+        {
+            "policy_type": "life",
+            "priority": "medium",
+            "reason": "Consider a starter life insurance policy for your child",
+            "suggested_coverage": 100000
+        },
+    ),
+    "house_purchase": (
+        {
+            "policy_type": "property",
+            "priority": "high",
+            "reason": "Protect your new home with comprehensive homeowner's insurance",
+            "suggested_coverage": 400000
+        },
+    ),
+    "new_baby": (
+        {
+            "policy_type": "life",
+            "priority": "high",
+            "reason": "Increase life insurance to protect your growing family",
+            "suggested_coverage": 750000
+        },
+    ),
+    "retirement": (
+        {
+            "policy_type": "life",
+            "priority": "medium",
+            "reason": "Review life insurance needs - you may need less coverage or different type",
+            "suggested_coverage": 250000
+        },
+        {
+            "policy_type": "property",
+            "priority": "low",
+            "reason": "Consider adjusting property coverage if downsizing",
+            "suggested_coverage": 300000
+        },
+    )
+}
+
+# Display names for life event types ("new_baby" -> "New Baby"); unknown types are added on first use
+_EVENT_DISPLAY = {t: t.replace("_", " ").title() for t in _EVENT_RECOMMENDATIONS}
+
+# Priority marker shown next to each recommendation
+_PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+
+def event_display_name(event_type: str) -> str:
+    """Human-readable name for a life event type."""
+    name = _EVENT_DISPLAY.get(event_type)
+    if name is None:
+        name = _EVENT_DISPLAY[event_type] = event_type.replace("_", " ").title()
+    return name
+
+
+# Standard coverage recommendation per policy type, for customers without one
+_ALL_TYPES = {
+    "life": {
+        "priority": "high",
+        "reason": "Life insurance protects your family's financial future",
+        "suggested_coverage": 500000
+    },
+    "property": {
+        "priority": "medium",
+        "reason": "Property insurance protects your home and belongings",
+        "suggested_coverage": 350000
+    },
+    "vehicle": {
+        "priority": "medium",
+        "reason": "Vehicle insurance is required and protects against accidents",
+        "suggested_coverage": 50000
     }
-    
-    return recommendations.get(event_type, [])
+}
+# Gaps are listed in sorted type order, which is also the order above
+_ALL_TYPE_NAMES = frozenset(_ALL_TYPES)
 
 
+@read_snapshot()
 def get_coverage_gaps(customer_id: str) -> list[dict]:
     """
     Identify gaps in customer's current coverage.
@@ -120,42 +155,12 @@ def get_coverage_gaps(customer_id: str) -> list[dict]:
     Returns:
         List of missing policy types with recommendations
     """
-    policies = get_policies_by_customer(customer_id)
-    active_policies = [p for p in policies if p["status"] == "active"]
-    
     # Get policy types customer already has
-    existing_types = {p["policy_type"] for p in active_policies}
-    
-    # Define standard coverage recommendation
-    all_types = {
-        "life": {
-            "priority": "high",
-            "reason": "Life insurance protects your family's financial future",
-            "suggested_coverage": 500000
-        },
-        "property": {
-            "priority": "medium",
-            "reason": "Property insurance protects your home and belongings",
-            "suggested_coverage": 350000
-        },
-        "vehicle": {
-            "priority": "medium",
-            "reason": "Vehicle insurance is required and protects against accidents",
-            "suggested_coverage": 50000
-        }
-    }
-    
-    gaps = []
-    for policy_type, details in all_types.items():
-        if policy_type not in existing_types:
-            gaps.append({
-                "policy_type": policy_type,
-                **details
-            })
-    
-    return gaps
+    missing = _ALL_TYPE_NAMES - active_policy_summary(customer_id).existing_types
+    return [{"policy_type": policy_type, **_ALL_TYPES[policy_type]} for policy_type in sorted(missing)]
 
 
+@read_snapshot()
 def get_recommendations(customer_id: str) -> str:
     """
     Get comprehensive policy recommendations for a customer.
@@ -171,16 +176,16 @@ def get_recommendations(customer_id: str) -> str:
     if not customer:
         return "Customer not found."
     
-    result = f"## Policy Recommendations for {customer['name']}\n\n"
+    parts = [f"## Policy Recommendations for {customer['name']}\n\n"]
     
     # Check for life events
     life_events = analyze_life_events(customer_id)
     
     if life_events:
-        result += "### 🎯 Based on Your Life Events\n\n"
+        parts.append("### 🎯 Based on Your Life Events\n\n")
         
         for event in life_events:
-            event_type_display = event["event_type"].replace("_", " ").title()
+            event_type_display = event_display_name(event["event_type"])
             
             if event["days_until"] > 0:
                 timing = f"(in {event['days_until']} days)"
@@ -189,34 +194,40 @@ def get_recommendations(customer_id: str) -> str:
             else:
                 timing = f"({abs(event['days_until'])} days ago)"
             
-            result += f"**{event_type_display}** {timing}\n"
+            parts.append(f"**{event_type_display}** {timing}\n")
             
             for rec in event["recommendations"]:
-                priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}[rec["priority"]]
-                result += f"- {priority_emoji} **{rec['policy_type'].title()} Insurance**: {rec['reason']}\n"
-                result += f"  - Suggested coverage: £{rec['suggested_coverage']:,}\n"
+                priority_emoji = _PRIORITY_EMOJI[rec["priority"]]
+                parts.append(
+                    f"- {priority_emoji} **{rec['policy_type'].title()} Insurance**: {rec['reason']}\n"
+                    f"  - Suggested coverage: £{rec['suggested_coverage']:,}\n"
+                )
             
-            result += "\n"
+            parts.append("\n")
     
     # Check for coverage gaps
     gaps = get_coverage_gaps(customer_id)
     
     if gaps:
-        result += "### 📋 Coverage Gaps Identified\n\n"
+        parts.append("### 📋 Coverage Gaps Identified\n\n")
         
         for gap in gaps:
-            priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}[gap["priority"]]
-            result += f"{priority_emoji} **{gap['policy_type'].title()} Insurance**\n"
-            result += f"- {gap['reason']}\n"
-            result += f"- Recommended coverage: £{gap['suggested_coverage']:,}\n\n"
+            priority_emoji = _PRIORITY_EMOJI[gap["priority"]]
+            parts.append(
+                f"{priority_emoji} **{gap['policy_type'].title()} Insurance**\n"
+                f"- {gap['reason']}\n"
+                f"- Recommended coverage: £{gap['suggested_coverage']:,}\n\n"
+            )
     
     # If no recommendations
     if not life_events and not gaps:
-        result += "✅ **Great news!** Your current coverage appears comprehensive.\n\n"
-        result += "We'll continue to monitor for any changes in your situation "
-        result += "and notify you of relevant opportunities.\n"
+        parts.append(
+            "✅ **Great news!** Your current coverage appears comprehensive.\n\n"
+            "We'll continue to monitor for any changes in your situation "
+            "and notify you of relevant opportunities.\n"
+        )
     
-    return result
+    return "".join(parts)
 
 
 def mark_event_processed(event_id: str) -> bool:
@@ -229,15 +240,55 @@ def mark_event_processed(event_id: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    events = load_json("life_events.json")
-    
-    for event in events:
-        if event["id"] == event_id:
-            event["processed"] = True
-            save_json("life_events.json", events)
-            return True
-    
-    return False
+    return patch_row("life_events.json", event_id, {"processed": True}) is not None
+
+
+# Situation keywords per policy type, matched as whole words (so "care" or
+# "parent" no longer count as "car" / "rent"); plural, agent-noun and compound
+# forms the old substring test caught are listed explicitly
+_WORD_RE = re.compile(r"[a-z]+")
+_FAMILY_WORDS = frozenset({
+    "family", "families", "married", "remarried", "spouse", "spouses",
+    "kids", "grandkids", "stepkids", "children", "grandchildren", "stepchildren"
+})
+_HOME_WORDS = frozenset({
+    "home", "homes", "homeowner", "homeowners",
+    "house", "houses", "household", "households", "householder", "householders",
+    "townhouse", "townhouses", "farmhouse", "houseboat",
+    "apartment", "apartments", "property",
+    "rent", "rents", "renting", "rented", "rental", "rentals", "renter", "renters"
+})
+_VEHICLE_WORDS = frozenset({
+    "car", "cars", "carpool", "carpooling", "vehicle", "vehicles",
+    "drive", "drives", "driven", "driver", "drivers",
+    "commute", "commutes", "commuter", "commuters", "commuting"
+})
+
+# (keywords, suggestion) in display order, and the fallback when none match
+_SITUATION_SUGGESTIONS = (
+    (_FAMILY_WORDS, {
+        "type": "life",
+        "reason": "Protect your family's financial future",
+        "coverage": 500000,
+        "priority": "high"
+    }),
+    (_HOME_WORDS, {
+        "type": "property",
+        "reason": "Protect your home and belongings",
+        "coverage": 350000,
+        "priority": "high"
+    }),
+    (_VEHICLE_WORDS, {
+        "type": "vehicle",
+        "reason": "Required coverage for drivers",
+        "coverage": 50000,
+        "priority": "high"
+    }),
+)
+_DEFAULT_SUGGESTIONS = (
+    {"type": "life", "reason": "Essential protection for everyone", "coverage": 250000, "priority": "medium"},
+    {"type": "vehicle", "reason": "Protection for your transportation", "coverage": 30000, "priority": "medium"}
+)
 
 
 def suggest_for_new_customer(situation: str) -> str:
@@ -250,53 +301,31 @@ def suggest_for_new_customer(situation: str) -> str:
     Returns:
         Formatted string with policy suggestions
     """
-    result = "## Recommended Coverage for You\n\n"
-    result += "Based on your situation, here are our recommendations:\n\n"
-    
-    suggestions = []
-    
-    # Parse situation keywords
-    situation_lower = situation.lower()
-    
-    if any(word in situation_lower for word in ["family", "married", "spouse", "kids", "children"]):
-        suggestions.append({
-            "type": "life",
-            "reason": "Protect your family's financial future",
-            "coverage": 500000,
-            "priority": "high"
-        })
-    
-    if any(word in situation_lower for word in ["home", "house", "apartment", "property", "rent"]):
-        suggestions.append({
-            "type": "property",
-            "reason": "Protect your home and belongings",
-            "coverage": 350000,
-            "priority": "high"
-        })
+    parts = [
+        "## Recommended Coverage for You\n\n"
+        "Based on your situation, here are our recommendations:\n\n"
+    ]
     
-    if any(word in situation_lower for word in ["car", "vehicle", "drive", "commute"]):
-        suggestions.append({
-            "type": "vehicle",
-            "reason": "Required coverage for drivers",
-            "coverage": 50000,
-            "priority": "high"
-        })
+    # Parse situation keywords: one tokenization, then set intersections
+    tokens = set(_WORD_RE.findall(situation.lower()))
+    suggestions = [sug for words, sug in _SITUATION_SUGGESTIONS if words & tokens]
     
     # Default suggestion if nothing matched
     if not suggestions:
-        suggestions = [
-            {"type": "life", "reason": "Essential protection for everyone", "coverage": 250000, "priority": "medium"},
-            {"type": "vehicle", "reason": "Protection for your transportation", "coverage": 30000, "priority": "medium"}
-        ]
+        suggestions = _DEFAULT_SUGGESTIONS
     
     for i, sug in enumerate(suggestions, 1):
-        priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}[sug["priority"]]
-        result += f"### {i}. {sug['type'].title()} Insurance {priority_emoji}\n"
-        result += f"- **Why**: {sug['reason']}\n"
-        result += f"- **Suggested Coverage**: £{sug['coverage']:,}\n\n"
+        priority_emoji = _PRIORITY_EMOJI[sug["priority"]]
+        parts.append(
+            f"### {i}. {sug['type'].title()} Insurance {priority_emoji}\n"
+            f"- **Why**: {sug['reason']}\n"
+            f"- **Suggested Coverage**: £{sug['coverage']:,}\n\n"
+        )
     
-    result += "---\n"
-    result += "Would you like to proceed with any of these options? "
-    result += "I can provide detailed quotes and help you complete your purchase.\n"
+    parts.append(
+        "---\n"
+        "Would you like to proceed with any of these options? "
+        "I can provide detailed quotes and help you complete your purchase.\n"
+    )
     
-    return result
+    return "".join(parts)
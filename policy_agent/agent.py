@@ -1,51 +1,7 @@
-# In your agent.py code
-from google import genai
-
-client = genai.Client(
-    project="dbs-data-ai-ai-core", # or os.environ.get("GOOGLE_CLOUD_PROJECT")
-    location="us-central1"        # or os.environ.get("GOOGLE_CLOUD_LOCATION")
-)
-
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Any, Dict, Optional, Union
 from google.adk.tools import ToolContext # Ensure this is imported
 from google.adk.agents.llm_agent import Agent
 
-class PolicyDetails(BaseModel):
-    # Main Data
-    policy_number: str = Field(description="The alphanumeric policy identifier.")
-    insured_name: str = Field(description="Full name of policy holder.")
-    effective_date: Optional[str] = Field(default=None)
-    premium_amount: Optional[float] = Field(default=None)
-    currency: str = Field(default="GBP")
-
-    # Separation Objects
-    missing_info: Dict[str, str] = Field(default_factory=dict)
-    other_attributes: Dict[str, Any] = Field(default_factory=dict)
-
-    @field_validator('*', mode='before')
-    @classmethod
-    def normalize_missing(cls, v: Any) -> Any:
-        placeholders = {'n/a', 'na', 'not provided', 'not available', 'none', '', 'null'}
-        if v is None or (isinstance(v, str) and v.strip().lower() in placeholders):
-            return "NOT PROVIDED"
-        return v
-
-    @model_validator(mode='after')
-    def relocate_missing_info(self) -> 'PolicyDetails':
-        """Physically moves 'NOT PROVIDED' fields to the missing_info object."""
-        for f in ["effective_date", "premium_amount"]:
-            if getattr(self, f) == "NOT PROVIDED":
-                self.missing_info[f] = "NOT PROVIDED"
-                setattr(self, f, None)
-        
-        # Check other_attributes for missing entries
-        temp_other = self.other_attributes.copy()
-        for k, v in temp_other.items():
-            if v == "NOT PROVIDED":
-                self.missing_info[k] = "NOT PROVIDED"
-                del self.other_attributes[k]
-        return self
+from .schema import PolicyDetails
 
 def parse_pdf_content(details: PolicyDetails, tool_context: ToolContext) -> dict:
     """
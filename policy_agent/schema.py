@@ -0,0 +1,65 @@
+# Shared by agent.py and agent_1301.py
+from functools import cache
+from typing import Annotated, Any, Dict, Optional
+
+from google import genai
+from pydantic import BaseModel, BeforeValidator, Field, model_validator
+
+
+@cache
+def get_client() -> genai.Client:
+    """Vertex AI client, created on first use and shared by every caller."""
+    return genai.Client(
+        vertexai=True,
+        project="dbs-data-ai-ai-core", # or os.environ.get("GOOGLE_CLOUD_PROJECT")
+        location="us-central1"        # or os.environ.get("GOOGLE_CLOUD_LOCATION")
+    )
+
+
+_PLACEHOLDERS = frozenset({'n/a', 'na', 'not provided', 'not available', 'none', '', 'null'})
+# Longer strings can only be placeholders if they carry surrounding whitespace
+_MAX_PLACEHOLDER_LEN = max(map(len, _PLACEHOLDERS))
+
+
+def _norm(v: Any) -> Any:
+    """Map None and placeholder strings ('N/A', 'null', ...) to 'NOT PROVIDED'."""
+    if v is None:
+        return "NOT PROVIDED"
+    if (isinstance(v, str)
+            and (len(v) <= _MAX_PLACEHOLDER_LEN or v[:1].isspace() or v[-1:].isspace())
+            and v.strip().lower() in _PLACEHOLDERS):
+        return "NOT PROVIDED"
+    return v
+
+
+# Scalar fields that may come back as a placeholder; the dict fields skip this
+_Normalized = BeforeValidator(_norm)
+
+
+class PolicyDetails(BaseModel):
+    # Main Data
+    policy_number: Annotated[str, _Normalized] = Field(description="The alphanumeric policy identifier.")
+    insured_name: Annotated[str, _Normalized] = Field(description="Full name of policy holder.")
+    effective_date: Annotated[Optional[str], _Normalized] = Field(default=None)
+    premium_amount: Annotated[Optional[float], _Normalized] = Field(default=None)
+    currency: Annotated[str, _Normalized] = Field(default="GBP")
+
+    # Separation Objects
+    missing_info: Dict[str, str] = Field(default_factory=dict)
+    other_attributes: Dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode='after')
+    def relocate_missing_info(self) -> 'PolicyDetails':
+        """Physically moves 'NOT PROVIDED' fields to the missing_info object."""
+        for f in ["effective_date", "premium_amount"]:
+            if getattr(self, f) == "NOT PROVIDED":
+                self.missing_info[f] = "NOT PROVIDED"
+                setattr(self, f, None)
+        
+        # Check other_attributes for missing entries
+        temp_other = self.other_attributes.copy()
+        for k, v in temp_other.items():
+            if v == "NOT PROVIDED":
+                self.missing_info[k] = "NOT PROVIDED"
+                del self.other_attributes[k]
+        return self